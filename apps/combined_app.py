@@ -3,10 +3,12 @@ Combined Application - GPS Track Combined Viewer
 Displays both map and curve viewers in a single window with shared track management
 """
 
-from typing import List, Optional
+from typing import Dict, List, Optional
+import hashlib
 import os
-import json
-from datetime import datetime
+import time
+
+import numpy as np
 
 from PyQt5.QtWidgets import (
     QMainWindow,
@@ -21,11 +23,16 @@ from PyQt5.QtWidgets import (
     QFileDialog,
     QMessageBox,
 )
-from PyQt5.QtWebEngineWidgets import QWebEngineView
-from PyQt5.QtCore import Qt, QUrl, QEventLoop, QTimer
+from PyQt5.QtWebEngineWidgets import QWebEnginePage, QWebEngineView
+from PyQt5.QtWebChannel import QWebChannel
+from PyQt5.QtCore import Qt, QTimer
 
 from models.track import Track
+from ui.gzip_scheme import GZIP_SCHEME, GzipSchemeHandler
+from ui.map_view_bridge import MapViewBridge
+from ui.screenshot_writer import ScreenshotWriter
 from ui.track_manager_widget import TrackManagerWidget
+from ui.web_profile import shared_profile
 from viewer.map_viewer import MapViewer
 from viewer.curve_viewer import CurveViewer
 from viewer.power_curve_viewer import PowerCurveViewer
@@ -34,6 +41,13 @@ from viewer.power_curve_viewer import PowerCurveViewer
 class CombinedWindow(QMainWindow):
     """Main window combining map and curve viewers with shared track management"""
 
+    # QWebChannel name of the map view bridge
+    MAP_BRIDGE_NAME = "view_bridge"
+    # Map options baked into the page itself; any other option change only
+    # redraws the track layer of the loaded page
+    MAP_PAGE_OPTIONS = ('base_map', 'zoom_control')
+    SCREENSHOT_FILTER = "PNG Images (*.png);;JPEG Images (*.jpg);;All Files (*)"
+
     def __init__(self):
         super().__init__()
         self.setWindowTitle("GPS Tracklog Combined Viewer")
@@ -42,11 +56,22 @@ class CombinedWindow(QMainWindow):
         # Data
         self.tracks: List[Track] = []
         self.view_state: dict = {}
+        # Content key of what each view currently displays (see _view_key)
+        self._last_view_hashes: dict = {}
+        # Page options of the loaded track map (None when no track map is shown)
+        self._map_page_options: Optional[dict] = None
+        self._map_loaded = False
+        # Rendered empty map page per (base_map, zoom_control)
+        self._empty_map_cache: Dict[tuple, str] = {}
+        # (min, max) of each map color mode over the loaded tracks
+        self._value_ranges: Dict[str, tuple] = {}
 
         # Viewers
         self.map_viewer = MapViewer()
         self.curve_viewer = CurveViewer()
         self.power_curve_viewer = PowerCurveViewer()
+        self.screenshot_writer = ScreenshotWriter(self)
+        self.screenshot_writer.finished.connect(self.on_screenshot_saved)
 
         # Map properties
         self.base_map = "OpenTopoMap"
@@ -66,31 +91,50 @@ class CombinedWindow(QMainWindow):
         self.color_min_curve: Optional[float] = None
         self.color_max_curve: Optional[float] = None
         self.show_legend_curve = True
+        self.smooth_data_curve = False
         
         # Power curve properties
         self.show_legend_power = True
 
+        # Property changes arriving in a burst are coalesced into one regeneration
+        self._pending_fit_bounds = False
+        self._pending_regen_timer = QTimer(self)
+        self._pending_regen_timer.setSingleShot(True)
+        self._pending_regen_timer.setInterval(50)
+        self._pending_regen_timer.timeout.connect(self._flush_regenerate)
+
         # UI setup
         self._setup_ui()
         # Defer empty view initialization until window is shown
-        from PyQt5.QtCore import QTimer
-        QTimer.singleShot(100, self._initialize_empty_views)
+        self._init_views_timer = QTimer(self)
+        self._init_views_timer.setSingleShot(True)
+        self._init_views_timer.timeout.connect(self._initialize_empty_views)
+        self._init_views_timer.start(100)
         self.statusBar().showMessage("Ready")
 
     def _setup_ui(self):
-        """Setup central widget (stacked viewers) and docks for track manager and properties"""
-        # Map tab
-        # Curve tab
-        # Track manager dock
-
-    def _setup_ui(self):
-        from PyQt5.QtWidgets import QDockWidget
-
+        """Setup the viewer docks, the track manager dock and the property docks"""
         # Enable dock nesting to allow docks to fill the entire window
         self.setDockNestingEnabled(True)
 
         # Map viewer dock (will occupy center area)
         self.map_view = QWebEngineView()
+        # Persistent profile: tiles stay cached across reloads and runs
+        self.map_view.setPage(QWebEnginePage(shared_profile(), self.map_view))
+        self.map_view.loadFinished.connect(self.on_map_load_finished)
+        # The page pushes its center/zoom through this bridge, so the current
+        # view is always known without querying the page
+        self.map_bridge = MapViewBridge(self)
+        self.map_bridge.view_changed.connect(self.on_map_view_changed)
+        self.map_channel = QWebChannel(self.map_view.page())
+        self.map_channel.registerObject(self.MAP_BRIDGE_NAME, self.map_bridge)
+        self.map_view.page().setWebChannel(self.map_channel)
+        # Track maps are written compressed and served through gzhtml://
+        self.map_scheme_handler = GzipSchemeHandler(self)
+        self.map_view.page().profile().installUrlSchemeHandler(GZIP_SCHEME, self.map_scheme_handler)
+        # Resolved once: later writes and loads do not depend on the working directory
+        self.map_file = os.path.abspath('track_map.html.gz')
+        self.map_url = self.map_scheme_handler.add_file('track_map', self.map_file)
         self.map_dock = QDockWidget("Map Viewer", self)
         self.map_dock.setWidget(self.map_view)
         self.map_dock.setAllowedAreas(Qt.AllDockWidgetAreas)
@@ -284,160 +328,30 @@ class CombinedWindow(QMainWindow):
         self.show_legend_checkbox_curve.stateChanged.connect(self.on_show_legend_curve_changed)
         display_layout.addRow("Show legend:", self.show_legend_checkbox_curve)
 
-        return properties_widget
-        properties_dock = QDockWidget("Map Properties", self)
-        properties_dock.setAllowedAreas(Qt.LeftDockWidgetArea | Qt.RightDockWidgetArea | Qt.BottomDockWidgetArea)
-
-        properties_widget = QWidget()
-        properties_layout = QFormLayout()
-        properties_widget.setLayout(properties_layout)
-
-        # Base map settings
-        map_group = QGroupBox("Base map settings")
-        map_layout = QFormLayout()
-        map_group.setLayout(map_layout)
-        properties_layout.addRow(map_group)
-
-        self.base_map_combo = QComboBox()
-        self.base_map_combo.addItems(MapViewer.AVAILABLE_BASE_MAPS)
-        self.base_map_combo.setCurrentText(self.base_map)
-        self.base_map_combo.currentTextChanged.connect(self.on_base_map_changed)
-        map_layout.addRow("Base map:", self.base_map_combo)
-
-        # Track color settings
-        track_group = QGroupBox("Track color settings")
-        track_layout = QFormLayout()
-        track_group.setLayout(track_layout)
-        properties_layout.addRow(track_group)
-
-        self.track_color_combo = QComboBox()
-        self.track_color_combo.addItems(MapViewer.COLOR_MODES)
-        self.track_color_combo.setCurrentText(self.track_color_mode)
-        self.track_color_combo.currentTextChanged.connect(self.on_track_color_changed)
-        track_layout.addRow("Track color:", self.track_color_combo)
-
-        self.colormap_combo_map = QComboBox()
-        self.colormap_combo_map.addItems(MapViewer.AVAILABLE_COLORMAPS)
-        self.colormap_combo_map.setCurrentText(self.colormap_map)
-        self.colormap_combo_map.setEnabled(False)  # Enabled when color mode != Plain
-        self.colormap_combo_map.currentTextChanged.connect(self.on_colormap_map_changed)
-        track_layout.addRow("Colormap:", self.colormap_combo_map)
-
-        self.color_min_spinbox_map = QDoubleSpinBox()
-        self.color_min_spinbox_map.setRange(-999999, 999999)
-        self.color_min_spinbox_map.setDecimals(2)
-        self.color_min_spinbox_map.setEnabled(False)
-        self.color_min_spinbox_map.editingFinished.connect(self.on_color_min_map_changed)
-        track_layout.addRow("Color min:", self.color_min_spinbox_map)
-
-        self.color_max_spinbox_map = QDoubleSpinBox()
-        self.color_max_spinbox_map.setRange(-999999, 999999)
-        self.color_max_spinbox_map.setDecimals(2)
-        self.color_max_spinbox_map.setEnabled(False)
-        self.color_max_spinbox_map.editingFinished.connect(self.on_color_max_map_changed)
-        track_layout.addRow("Color max:", self.color_max_spinbox_map)
-
-        # Display settings
-        display_group = QGroupBox("Viewer display settings")
-        display_layout = QFormLayout()
-        display_group.setLayout(display_layout)
-        properties_layout.addRow(display_group)
-
-        self.show_start_stop_checkbox = QCheckBox()
-        self.show_start_stop_checkbox.setChecked(self.show_start_stop)
-        self.show_start_stop_checkbox.stateChanged.connect(self.on_show_start_stop_changed)
-        display_layout.addRow("Show start and stop:", self.show_start_stop_checkbox)
-
-        self.show_legend_checkbox_map = QCheckBox()
-        self.show_legend_checkbox_map.setChecked(self.show_legend_map)
-        self.show_legend_checkbox_map.stateChanged.connect(self.on_show_legend_map_changed)
-        display_layout.addRow("Show legend:", self.show_legend_checkbox_map)
-
-        self.show_zoom_controls_checkbox = QCheckBox()
-        self.show_zoom_controls_checkbox.setChecked(self.show_zoom_controls)
-        self.show_zoom_controls_checkbox.stateChanged.connect(self.on_show_zoom_controls_changed)
-        display_layout.addRow("Show zoom controls:", self.show_zoom_controls_checkbox)
-
-        properties_dock.setWidget(properties_widget)
-        self.addDockWidget(Qt.LeftDockWidgetArea, properties_dock)
-        self.splitDockWidget(self.track_manager, properties_dock, Qt.Vertical)
-
-    def _setup_curve_properties_dock(self):
-        properties_dock = QDockWidget("Curve Properties", self)
-        properties_dock.setAllowedAreas(Qt.LeftDockWidgetArea | Qt.RightDockWidgetArea | Qt.BottomDockWidgetArea)
-
-        properties_widget = QWidget()
-        properties_layout = QFormLayout()
-        properties_widget.setLayout(properties_layout)
-
-        # Data selection
-        data_group = QGroupBox("Data Selection")
-        data_layout = QFormLayout()
-        data_group.setLayout(data_layout)
-        properties_layout.addRow(data_group)
-
-        self.x_data_combo = QComboBox()
-        self.x_data_combo.addItems(CurveViewer.AVAILABLE_DATA)
-        self.x_data_combo.setCurrentText(self.x_data)
-        self.x_data_combo.currentTextChanged.connect(self.on_x_data_changed)
-        data_layout.addRow("X-Axis:", self.x_data_combo)
-
-        self.y_data_combo = QComboBox()
-        self.y_data_combo.addItems(CurveViewer.AVAILABLE_DATA)
-        self.y_data_combo.setCurrentText(self.y_data)
-        self.y_data_combo.currentTextChanged.connect(self.on_y_data_changed)
-        data_layout.addRow("Y-Axis:", self.y_data_combo)
-
-        self.color_data_combo = QComboBox()
-        self.color_data_combo.addItems(["None"] + CurveViewer.AVAILABLE_DATA)
-        self.color_data_combo.setCurrentText(self.color_data)
-        self.color_data_combo.currentTextChanged.connect(self.on_color_data_changed)
-        data_layout.addRow("Color By:", self.color_data_combo)
-
-        # Display settings
-        display_group = QGroupBox("Display Settings")
-        display_layout = QFormLayout()
-        display_group.setLayout(display_layout)
-        properties_layout.addRow(display_group)
-
-        self.colormap_combo_curve = QComboBox()
-        self.colormap_combo_curve.addItems(CurveViewer.AVAILABLE_COLORMAPS)
-        self.colormap_combo_curve.setCurrentText(self.colormap_curve)
-        self.colormap_combo_curve.setEnabled(False)  # until color data selected
-        self.colormap_combo_curve.currentTextChanged.connect(self.on_colormap_curve_changed)
-        display_layout.addRow("Colormap:", self.colormap_combo_curve)
-
-        self.color_min_spinbox_curve = QDoubleSpinBox()
-        self.color_min_spinbox_curve.setRange(-999999, 999999)
-        self.color_min_spinbox_curve.setDecimals(2)
-        self.color_min_spinbox_curve.setEnabled(False)
-        self.color_min_spinbox_curve.editingFinished.connect(self.on_color_min_curve_changed)
-        display_layout.addRow("Color min:", self.color_min_spinbox_curve)
-
-        self.color_max_spinbox_curve = QDoubleSpinBox()
-        self.color_max_spinbox_curve.setRange(-999999, 999999)
-        self.color_max_spinbox_curve.setDecimals(2)
-        self.color_max_spinbox_curve.setEnabled(False)
-        self.color_max_spinbox_curve.editingFinished.connect(self.on_color_max_curve_changed)
-        display_layout.addRow("Color max:", self.color_max_spinbox_curve)
-
-        self.show_legend_checkbox_curve = QCheckBox()
-        self.show_legend_checkbox_curve.setChecked(self.show_legend_curve)
-        self.show_legend_checkbox_curve.stateChanged.connect(self.on_show_legend_curve_changed)
-        display_layout.addRow("Show legend:", self.show_legend_checkbox_curve)
-
-        properties_dock.setWidget(properties_widget)
-        self.addDockWidget(Qt.LeftDockWidgetArea, properties_dock)
-        self.splitDockWidget(self.track_manager, properties_dock, Qt.Vertical)
+        self.smooth_data_checkbox = QCheckBox()
+        self.smooth_data_checkbox.setChecked(self.smooth_data_curve)
+        self.smooth_data_checkbox.stateChanged.connect(self.on_smooth_data_changed)
+        display_layout.addRow("Smooth data:", self.smooth_data_checkbox)
 
+        return properties_widget
 
     def _initialize_empty_views(self):
+        self._last_view_hashes = {}
+
         # Empty map centered on Lausanne
-        lausanne_coords = [46.5197, 6.6323]
-        m = self.map_viewer._create_base_map(lausanne_coords, self.base_map, zoom_control=self.show_zoom_controls)
-        map_file = os.path.abspath('track_map.html')
-        m.save(map_file)
-        self.map_view.setUrl(QUrl.fromLocalFile(map_file))
+        cache_key = (self.base_map, self.show_zoom_controls)
+        map_html = self._empty_map_cache.get(cache_key)
+        if map_html is None:
+            lausanne_coords = [46.5197, 6.6323]
+            m = self.map_viewer._create_base_map(lausanne_coords, self.base_map, zoom_control=self.show_zoom_controls,
+                                                 view_bridge=self.MAP_BRIDGE_NAME)
+            map_html = m.get_root().render()
+            self._empty_map_cache[cache_key] = map_html
+        self._map_page_options = None
+        self._map_loaded = False
+        # The page is small and static, load it without going through a file;
+        # the base URL keeps the same origin as the track map pages
+        self.map_view.setHtml(map_html, self.map_url)
 
         # Empty curve view
         canvas, toolbar = self.curve_viewer.create_view([], None)
@@ -448,6 +362,9 @@ class CombinedWindow(QMainWindow):
         self._set_power_curve_content(power_canvas, power_toolbar)
 
     def _set_curve_content(self, canvas, toolbar):
+        # The viewer redraws into its current canvas, already in the layout
+        if canvas is not None and self.curve_layout.indexOf(canvas) >= 0:
+            return
         # Clear and set new content
         while self.curve_layout.count():
             item = self.curve_layout.takeAt(0)
@@ -459,6 +376,9 @@ class CombinedWindow(QMainWindow):
             self.curve_layout.addWidget(canvas)
     
     def _set_power_curve_content(self, canvas, toolbar):
+        # The viewer redraws into its current canvas, already in the layout
+        if canvas is not None and self.power_curve_layout.indexOf(canvas) >= 0:
+            return
         # Clear and set new content
         while self.power_curve_layout.count():
             item = self.power_curve_layout.takeAt(0)
@@ -472,20 +392,37 @@ class CombinedWindow(QMainWindow):
     # Track and property change handlers
     def on_tracks_changed(self, tracks: List[Track]):
         self.tracks = tracks
+        self._value_ranges = {}
+        self.curve_viewer.invalidate()
         if not self.tracks:
+            self._pending_regen_timer.stop()
             self._initialize_empty_views()
             self.view_state = {}
         else:
-            self._regenerate_views(fit_bounds=True)
+            self._schedule_regenerate(fit_bounds=True)
 
     def on_track_properties_changed(self):
         # Preserve map view when only properties change
-        self._regenerate_views(fit_bounds=False)
+        self._schedule_regenerate(fit_bounds=False)
+
+    def _get_value_range(self, color_mode: str) -> tuple:
+        """Min and max of color_mode over the loaded tracks, computed once per track set"""
+        if color_mode not in self._value_ranges:
+            self._value_ranges[color_mode] = self.map_viewer._get_value_range(self.tracks, color_mode)
+        return self._value_ranges[color_mode]
+
+    def on_map_view_changed(self, view_state: dict):
+        """Keep track of the map view reported by the page"""
+        self.view_state = view_state
+    
+    def on_map_load_finished(self, ok: bool):
+        """Track layer updates can only be sent to a fully loaded page"""
+        self._map_loaded = ok
     
     def on_map_screenshot_requested(self):
         """Handle map screenshot request"""
         # Generate default filename with timestamp
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        timestamp = time.strftime("%Y%m%d_%H%M%S")
         default_filename = f"map_screenshot_{timestamp}.png"
         
         # Ask user where to save
@@ -493,26 +430,43 @@ class CombinedWindow(QMainWindow):
             self,
             "Save Screenshot",
             default_filename,
-            "PNG Images (*.png);;JPEG Images (*.jpg);;All Files (*)"
+            self.SCREENSHOT_FILTER
         )
         
         if file_path:
-            # Capture the screenshot
-            pixmap = self.map_view.grab()
+            # Capture the screenshot (must happen on the GUI thread)
+            image = self.map_view.grab().toImage()
             
-            # Save the screenshot
-            if pixmap.save(file_path):
-                self.statusBar().showMessage(f"Screenshot saved: {file_path}")
-            else:
-                from PyQt5.QtWidgets import QMessageBox
-                QMessageBox.warning(self, "Error", "Failed to save screenshot")
+            # Encode and save it in the background
+            self.statusBar().showMessage(f"Saving screenshot: {file_path}")
+            self.screenshot_writer.save(image, file_path)
+    
+    def on_screenshot_saved(self, file_path: str, success: bool):
+        """Report the result of a background screenshot save"""
+        if success:
+            self.statusBar().showMessage(f"Screenshot saved: {file_path}")
+        else:
+            QMessageBox.warning(self, "Error", "Failed to save screenshot")
+
+    def closeEvent(self, event):
+        """Delete the map page while the shared profile it uses still exists"""
+        # The profile is only destroyed with the application, and a page left
+        # alive until then (the window being collected after it) outlives its
+        # profile. The page being a child of the view, unsetting it deletes it.
+        # Tracks still loading, or a pending view update, would otherwise
+        # redraw the map afterwards in a new page of the default profile.
+        self.track_manager.blockSignals(True)
+        self._init_views_timer.stop()
+        self._pending_regen_timer.stop()
+        self.map_view.setPage(None)
+        super().closeEvent(event)
 
     # Map property handlers
     def on_base_map_changed(self, value: str):
         self.base_map = value
         self.statusBar().showMessage(f"Base map set to: {value}")
         if self.tracks:
-            self._regenerate_views(fit_bounds=False)
+            self._schedule_regenerate(fit_bounds=False)
         else:
             self._initialize_empty_views()
 
@@ -520,7 +474,7 @@ class CombinedWindow(QMainWindow):
         self.track_color_mode = value
         # Enable colormap + range when not Plain
         if value != "Plain" and self.tracks:
-            computed_min, computed_max = self.map_viewer._get_value_range(self.tracks, value)
+            computed_min, computed_max = self._get_value_range(value)
             self.color_min_map = computed_min
             self.color_max_map = computed_max
             # Update spinboxes
@@ -541,43 +495,43 @@ class CombinedWindow(QMainWindow):
             self.colormap_combo_map.setEnabled(False)
         self.statusBar().showMessage(f"Track color mode set to: {value}")
         if self.tracks:
-            self._regenerate_views(fit_bounds=False)
+            self._schedule_regenerate(fit_bounds=False)
 
     def on_colormap_map_changed(self, value: str):
         self.colormap_map = value
         self.statusBar().showMessage(f"Colormap set to: {value}")
         if self.tracks:
-            self._regenerate_views(fit_bounds=False)
+            self._schedule_regenerate(fit_bounds=False)
 
     def on_color_min_map_changed(self):
         self.color_min_map = self.color_min_spinbox_map.value()
         self.statusBar().showMessage(f"Color min set to: {self.color_min_map:.2f}")
         if self.tracks:
-            self._regenerate_views(fit_bounds=False)
+            self._schedule_regenerate(fit_bounds=False)
 
     def on_color_max_map_changed(self):
         self.color_max_map = self.color_max_spinbox_map.value()
         self.statusBar().showMessage(f"Color max set to: {self.color_max_map:.2f}")
         if self.tracks:
-            self._regenerate_views(fit_bounds=False)
+            self._schedule_regenerate(fit_bounds=False)
 
     def on_show_start_stop_changed(self, state: int):
         self.show_start_stop = (state == Qt.Checked)
         self.statusBar().showMessage(f"Start/stop markers: {'On' if self.show_start_stop else 'Off'}")
         if self.tracks:
-            self._regenerate_views(fit_bounds=False)
+            self._schedule_regenerate(fit_bounds=False)
 
     def on_show_legend_map_changed(self, state: int):
         self.show_legend_map = (state == Qt.Checked)
         self.statusBar().showMessage(f"Legend (map): {'On' if self.show_legend_map else 'Off'}")
         if self.tracks:
-            self._regenerate_views(fit_bounds=False)
+            self._schedule_regenerate(fit_bounds=False)
 
     def on_show_zoom_controls_changed(self, state: int):
         self.show_zoom_controls = (state == Qt.Checked)
         self.statusBar().showMessage(f"Zoom controls: {'On' if self.show_zoom_controls else 'Off'}")
         if self.tracks:
-            self._regenerate_views(fit_bounds=False)
+            self._schedule_regenerate(fit_bounds=False)
         else:
             self._initialize_empty_views()
 
@@ -586,25 +540,25 @@ class CombinedWindow(QMainWindow):
         self.x_data = value
         self.statusBar().showMessage(f"X-axis set to: {value}")
         if self.tracks:
-            self._regenerate_views(fit_bounds=False)
+            self._schedule_regenerate(fit_bounds=False)
 
     def on_y_data_changed(self, value: str):
         self.y_data = value
         self.statusBar().showMessage(f"Y-axis set to: {value}")
         if self.tracks:
-            self._regenerate_views(fit_bounds=False)
+            self._schedule_regenerate(fit_bounds=False)
 
     def on_color_data_changed(self, value: str):
         self.color_data = value
         if value != "None" and self.tracks:
-            # Compute range from data
-            color_values = []
-            for track in self.tracks:
-                values = self.curve_viewer._get_data_values(track, value)
-                color_values.extend([v for v in values if v is not None])
-            if color_values:
-                self.color_min_curve = min(color_values)
-                self.color_max_curve = max(color_values)
+            # Compute range from data, ignoring missing values
+            color_values = np.concatenate([
+                np.asarray(self.curve_viewer._get_data_values(track, value), dtype=np.float64)
+                for track in self.tracks])
+            color_values = color_values[~np.isnan(color_values)]
+            if color_values.size:
+                self.color_min_curve = float(color_values.min())
+                self.color_max_curve = float(color_values.max())
                 self.color_min_spinbox_curve.blockSignals(True)
                 self.color_max_spinbox_curve.blockSignals(True)
                 self.color_min_spinbox_curve.setValue(self.color_min_curve)
@@ -622,39 +576,68 @@ class CombinedWindow(QMainWindow):
             self.color_max_spinbox_curve.setEnabled(False)
         self.statusBar().showMessage(f"Color by: {value}")
         if self.tracks:
-            self._regenerate_views(fit_bounds=False)
+            self._schedule_regenerate(fit_bounds=False)
 
     def on_colormap_curve_changed(self, value: str):
         self.colormap_curve = value
         self.statusBar().showMessage(f"Colormap (curve) set to: {value}")
         if self.tracks:
-            self._regenerate_views(fit_bounds=False)
+            self._schedule_regenerate(fit_bounds=False)
 
     def on_color_min_curve_changed(self):
         self.color_min_curve = self.color_min_spinbox_curve.value()
         self.statusBar().showMessage(f"Color min (curve) set to: {self.color_min_curve:.2f}")
         if self.tracks:
-            self._regenerate_views(fit_bounds=False)
+            self._schedule_regenerate(fit_bounds=False)
 
     def on_color_max_curve_changed(self):
         self.color_max_curve = self.color_max_spinbox_curve.value()
         self.statusBar().showMessage(f"Color max (curve) set to: {self.color_max_curve:.2f}")
         if self.tracks:
-            self._regenerate_views(fit_bounds=False)
+            self._schedule_regenerate(fit_bounds=False)
 
     def on_show_legend_curve_changed(self, state: int):
         self.show_legend_curve = (state == Qt.Checked)
         self.statusBar().showMessage(f"Legend (curve): {'On' if self.show_legend_curve else 'Off'}")
         if self.tracks:
-            self._regenerate_views(fit_bounds=False)
+            self._schedule_regenerate(fit_bounds=False)
+
+    def on_smooth_data_changed(self, state: int):
+        self.smooth_data_curve = (state == Qt.Checked)
+        self.statusBar().showMessage(f"Smoothing (curve): {'On' if self.smooth_data_curve else 'Off'}")
+        if self.tracks:
+            self._schedule_regenerate(fit_bounds=False)
 
     # View regeneration
+    def _schedule_regenerate(self, fit_bounds: bool = False):
+        """Request a regeneration; requests within the timer interval are merged"""
+        self._pending_fit_bounds = self._pending_fit_bounds or fit_bounds
+        self._pending_regen_timer.start()
+
+    def _flush_regenerate(self):
+        fit_bounds = self._pending_fit_bounds
+        self._pending_fit_bounds = False
+        if self.tracks:
+            self._regenerate_views(fit_bounds=fit_bounds)
+
     def _regenerate_views(self, fit_bounds: bool = False):
-        # Capture current view before regenerating (if not fitting bounds)
-        if not fit_bounds and self.tracks:
-            self._capture_current_view()
-        
-        # Map view generation
+        tracks_key = self._tracks_fingerprint()
+        self._regenerate_map_view(tracks_key, fit_bounds)
+        self._regenerate_curve_view(tracks_key)
+        self._regenerate_power_curve_view(tracks_key)
+
+    def _tracks_fingerprint(self) -> bytes:
+        """Identify the loaded tracks and the properties that change their rendering"""
+        return repr([
+            (id(track), len(track.points), track.name, track.color, getattr(track, 'line_width', 5))
+            for track in self.tracks
+        ]).encode()
+
+    def _view_key(self, options: dict, tracks_key: bytes) -> bytes:
+        """Content key of a view; equal keys mean the view would render identically"""
+        return hashlib.blake2b(repr(sorted(options.items())).encode() + tracks_key).digest()
+
+    def _regenerate_map_view(self, tracks_key: bytes, fit_bounds: bool):
         map_options = {
             'base_map': self.base_map,
             'color_mode': self.track_color_mode,
@@ -663,21 +646,39 @@ class CombinedWindow(QMainWindow):
             'show_legend': self.show_legend_map,
             'zoom_control': self.show_zoom_controls,
             'color_min': self.color_min_map,
-            'color_max': self.color_max_map,
-            'fit_bounds': fit_bounds
+            'color_max': self.color_max_map
         }
+        # The view itself (center/zoom) is not part of the key: an unchanged
+        # map keeps whatever view the user panned to
+        key = self._view_key(map_options, tracks_key)
+        if key == self._last_view_hashes.get('map'):
+            return
+
+        # Redraw the tracks in place when the page itself is unchanged
+        page_options = {name: map_options[name] for name in self.MAP_PAGE_OPTIONS}
+        if not fit_bounds and self._map_loaded and page_options == self._map_page_options:
+            self.map_view.page().runJavaScript(
+                self.map_viewer.create_track_layer_script(self.tracks, **map_options))
+            self._last_view_hashes['map'] = key
+            return
+
+        map_options['fit_bounds'] = fit_bounds
+        map_options['view_bridge'] = self.MAP_BRIDGE_NAME
         # Preserve center/zoom if not fitting bounds
         if not fit_bounds and self.view_state:
             map_options.update(self.view_state)
-        map_file, new_view_state = self.map_viewer.create_view(
+        _, new_view_state = self.map_viewer.create_view(
             self.tracks,
-            output_file='track_map.html',
+            output_file=self.map_file,
             **map_options
         )
         self.view_state = new_view_state
-        self.map_view.setUrl(QUrl.fromLocalFile(map_file))
+        self._map_page_options = page_options
+        self._map_loaded = False
+        self.map_view.setUrl(self.map_url)
+        self._last_view_hashes['map'] = key
 
-        # Curve view generation
+    def _regenerate_curve_view(self, tracks_key: bytes):
         curve_options = {
             'x_data': self.x_data,
             'y_data': self.y_data,
@@ -685,69 +686,33 @@ class CombinedWindow(QMainWindow):
             'colormap': self.colormap_curve,
             'color_min': self.color_min_curve,
             'color_max': self.color_max_curve,
-            'show_legend': self.show_legend_curve
+            'show_legend': self.show_legend_curve,
+            'smooth_data': self.smooth_data_curve
         }
+        key = self._view_key(curve_options, tracks_key)
+        last_key = self._last_view_hashes.get('curve')
+        if key == last_key:
+            return
+
+        # A legend toggle alone is applied to the current plot in place
+        legend_toggled = dict(curve_options, show_legend=not self.show_legend_curve)
+        if (self._view_key(legend_toggled, tracks_key) == last_key
+                and self.curve_viewer.set_legend_visible(self.show_legend_curve)):
+            self._last_view_hashes['curve'] = key
+            return
+
         canvas, toolbar = self.curve_viewer.create_view(self.tracks, curve_options)
         self._set_curve_content(canvas, toolbar)
-        
-        # Power curve view generation
+        self._last_view_hashes['curve'] = key
+
+    def _regenerate_power_curve_view(self, tracks_key: bytes):
         power_curve_options = {
             'show_legend': self.show_legend_power
         }
+        key = self._view_key(power_curve_options, tracks_key)
+        if key == self._last_view_hashes.get('power_curve'):
+            return
+
         power_canvas, power_toolbar = self.power_curve_viewer.create_view(self.tracks, power_curve_options)
         self._set_power_curve_content(power_canvas, power_toolbar)
-    
-    def _capture_current_view(self):
-        """Capture the current map center and zoom from the browser"""
-        # JavaScript to extract Leaflet map's current view
-        js_code = """
-        (function() {
-            try {
-                var map = null;
-                for (var key in window) {
-                    if (window[key] && window[key]._layers) {
-                        map = window[key];
-                        break;
-                    }
-                }
-                if (map) {
-                    var center = map.getCenter();
-                    var zoom = map.getZoom();
-                    return JSON.stringify({
-                        lat: center.lat,
-                        lng: center.lng,
-                        zoom: zoom
-                    });
-                }
-                return null;
-            } catch(e) {
-                return null;
-            }
-        })();
-        """
-        
-        # Use event loop to wait for JavaScript result
-        loop = QEventLoop()
-        result_holder = {'result': None}
-        
-        def handle_result(result):
-            result_holder['result'] = result
-            loop.quit()
-        
-        # Execute JavaScript
-        self.map_view.page().runJavaScript(js_code, handle_result)
-        
-        # Wait for result (max 200ms timeout)
-        QTimer.singleShot(200, loop.quit)
-        loop.exec_()
-        
-        # Parse result and update view settings
-        if result_holder['result']:
-            try:
-                view_data = json.loads(result_holder['result'])
-                self.view_state = {
-                    'current_center': [view_data['lat'], view_data['lng']],
-                    'current_zoom': int(view_data['zoom'])
-                }
-            except:
-                pass
+        self._last_view_hashes['power_curve'] = key
@@ -19,7 +19,7 @@ echo ""
 echo "Installing Python modules via apt..."
 sudo apt-get install -y \
     python3-folium \
-    python3-gpxpy \
+    python3-numpy \
     python3-pyqt5 \
     python3-pyqt5.qtwebengine
 
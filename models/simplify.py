@@ -0,0 +1,59 @@
+"""
+Polyline simplification - Ramer-Douglas-Peucker on latitude/longitude arrays
+"""
+
+import numpy as np
+
+
+def rdp_indices(lats: np.ndarray, lngs: np.ndarray, epsilon: float) -> np.ndarray:
+    """
+    Indices of the points kept by the Ramer-Douglas-Peucker algorithm
+
+    Distances are measured in degrees of latitude, longitudes being scaled by
+    cos(latitude) so that epsilon means the same distance in both directions.
+
+    Args:
+        lats: Point latitudes
+        lngs: Point longitudes
+        epsilon: Maximum distance (degrees) between the original and simplified line
+
+    Returns:
+        Sorted indices of the kept points (always including the first and last)
+    """
+    n = len(lats)
+    if n < 3:
+        return np.arange(n)
+
+    x = np.asarray(lngs, dtype=np.float64) * np.cos(np.radians(np.mean(lats)))
+    y = np.asarray(lats, dtype=np.float64)
+
+    keep = np.zeros(n, dtype=bool)
+    keep[0] = keep[-1] = True
+
+    # Iterative divide and conquer over (start, end) index ranges
+    stack = [(0, n - 1)]
+    while stack:
+        start, end = stack.pop()
+        if end - start < 2:
+            continue
+
+        dx = x[end] - x[start]
+        dy = y[end] - y[start]
+        px = x[start + 1:end] - x[start]
+        py = y[start + 1:end] - y[start]
+        length = np.hypot(dx, dy)
+        if length > 0:
+            # Perpendicular distance to the chord
+            distances = np.abs(dx * py - dy * px) / length
+        else:
+            # Closed loop: distance to the start point
+            distances = np.hypot(px, py)
+
+        farthest = int(np.argmax(distances))
+        if distances[farthest] > epsilon:
+            index = start + 1 + farthest
+            keep[index] = True
+            stack.append((start, index))
+            stack.append((index, end))
+
+    return np.flatnonzero(keep)
@@ -2,12 +2,107 @@
 Track data model - common structure for GPX and IGC tracks
 """
 
+import math
+import sys
 from dataclasses import dataclass
-from typing import List, Optional
-from datetime import datetime
+from operator import attrgetter
+from typing import Dict, Iterable, List, Optional, Tuple
+from datetime import datetime, timedelta
 
+import numpy as np
 
-@dataclass
+from .simplify import rdp_indices
+
+try:
+    from numba import njit
+except ImportError:  # numba is optional
+    njit = None
+
+
+EARTH_RADIUS_M = 6371000.0
+
+_MICROSECOND = timedelta(microseconds=1)
+
+# Cached arrays computed from the point coordinates
+_COORDINATE_KEYS = ('latlng', 'lat_rad', 'lng_rad', 'cos_lat', 'cumulative_distance')
+
+# Cached arrays computed from the point timestamps
+_TIME_KEYS = ('elapsed_time', 'elapsed_us')
+
+# Slotted dataclasses (no per-instance __dict__) need Python 3.10
+_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+
+def _segment_speeds_numpy(lat: np.ndarray, lng: np.ndarray, cos_lat: np.ndarray,
+                          times: np.ndarray) -> np.ndarray:
+    """
+    Haversine speed in km/h from each point to the next
+    
+    Args:
+        lat, lng: Coordinates in radians
+        cos_lat: Cosine of the latitudes
+        times: Point times in seconds (NaN where unknown)
+        
+    Returns:
+        One speed per segment, NaN where the time difference is not positive
+    """
+    dlat = lat[1:] - lat[:-1]
+    dlon = lng[1:] - lng[:-1]
+    sin_dlat = np.sin(dlat * 0.5)
+    sin_dlon = np.sin(dlon * 0.5)
+    a = sin_dlat * sin_dlat + cos_lat[:-1] * cos_lat[1:] * (sin_dlon * sin_dlon)
+    distances = 2 * EARTH_RADIUS_M * np.arcsin(np.sqrt(a))
+    time_diffs = times[1:] - times[:-1]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(time_diffs > 0, distances / time_diffs * 3.6, np.nan)
+
+
+if njit is not None:
+    # No fastmath: NaN times must keep failing the dt > 0 test
+    @njit(cache=True)
+    def _segment_speeds(lat, lng, cos_lat, times):
+        out = np.empty(lat.size - 1)
+        for i in range(1, lat.size):
+            dt = times[i] - times[i - 1]
+            if not dt > 0:
+                out[i - 1] = np.nan
+                continue
+            sin_dlat = math.sin((lat[i] - lat[i - 1]) * 0.5)
+            sin_dlon = math.sin((lng[i] - lng[i - 1]) * 0.5)
+            a = sin_dlat * sin_dlat + cos_lat[i - 1] * cos_lat[i] * (sin_dlon * sin_dlon)
+            out[i - 1] = 2 * EARTH_RADIUS_M * math.asin(math.sqrt(a)) / dt * 3.6
+        return out
+else:
+    _segment_speeds = _segment_speeds_numpy
+
+
+def _scan_window_bounds(t: np.ndarray, half_window: float) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Window bounds of unordered times, as found by scanning out from each point
+    
+    A window grows backward and forward from its point until the next time is
+    more than half_window away, so that a jump back in time (e.g. a midnight
+    rollover) ends it. All windows grow one step at a time together.
+    
+    Returns:
+        Start and (exclusive) end of each window
+    """
+    n = len(t)
+    lo = np.arange(n)
+    hi = lo + 1
+    # Next point outside each window: lo - 1 going backward, hi going forward
+    for bounds, step, offset in ((lo, -1, -1), (hi, 1, 0)):
+        growing = np.arange(n)
+        while growing.size:
+            candidates = bounds[growing] + offset
+            inside = (candidates >= 0) & (candidates < n)
+            inside[inside] = np.abs(t[candidates[inside]] - t[growing[inside]]) <= half_window
+            growing = growing[inside]
+            bounds[growing] += step
+    return lo, hi
+
+
+@dataclass(**_SLOTS)
 class TrackPoint:
     """Single point in a GPS track"""
     latitude: float
@@ -30,13 +125,21 @@ class TrackPoint:
     speed: Optional[float] = None  # m/s
     
     def to_latlng(self):
-        """Return as [lat, lng] for mapping libraries"""
-        return [self.latitude, self.longitude]
+        """Return as (lat, lng) for mapping libraries"""
+        return (self.latitude, self.longitude)
 
 
 class Track:
     """GPS Track containing multiple points"""
     
+    # Columns built by materialize(): those scanned when displaying a track
+    MATERIALIZED_COLUMNS = ('latitude', 'longitude', 'altitude', 'speed', 'power',
+                            'vertical_speed_mh')
+    
+    # Optional point attributes, measured or calculated
+    VALUE_ATTRIBUTES = ('altitude', 'pressure_altitude', 'vertical_speed_ms', 'vertical_speed_mh',
+                        'power', 'heart_rate', 'cadence', 'temperature', 'speed')
+    
     def __init__(self, name: str, track_type: str = "unknown"):
         """
         Initialize a track
@@ -50,25 +153,225 @@ class Track:
         self.points: List[TrackPoint] = []
         self.color: Optional[str] = None
         self.power_curve: Optional[dict] = None  # Power curve data
+        self._columns: Dict[str, np.ndarray] = {}  # Cached per-attribute arrays
+        self._bounds: Optional[dict] = None  # Cached get_bounds() result
+        self._has_values: Dict[str, bool] = {}  # Cached has_values() results
     
     def add_point(self, point: TrackPoint):
         """Add a point to the track"""
         self.points.append(point)
+        self._columns.clear()
+        self._bounds = None
+        self._has_values.clear()
+    
+    def extend(self, points: Iterable[TrackPoint]):
+        """Add several points to the track at once"""
+        self.points.extend(points)
+        self._columns.clear()
+        self._bounds = None
+        self._has_values.clear()
+    
+    def column(self, attribute: str) -> np.ndarray:
+        """
+        Return a TrackPoint numeric attribute of all points as a float array
+        
+        Missing values (None) are stored as NaN. The array is cached until the
+        points change and must not be modified by the caller.
+        
+        Args:
+            attribute: TrackPoint field name (e.g. 'altitude', 'power')
+        """
+        values = self._columns.get(attribute)
+        if values is None:
+            # NumPy stores None as NaN in float arrays
+            values = np.array(list(map(attrgetter(attribute), self.points)), dtype=np.float64)
+            self._columns[attribute] = values
+        return values
+    
+    def has_values(self, attribute: str) -> bool:
+        """
+        Whether any point has a value for a TrackPoint attribute
+        
+        Cached until the points change, so that checks done before each
+        computation do not rescan the track.
+        """
+        has_values = self._has_values.get(attribute)
+        if has_values is None:
+            values = self._columns.get(attribute)
+            if values is not None:
+                has_values = bool((~np.isnan(values)).any())
+            else:
+                # Scan without building the column, NaN counting as missing as there
+                has_values = any(v is not None and v == v
+                                 for v in map(attrgetter(attribute), self.points))
+            self._has_values[attribute] = has_values
+        return has_values
+    
+    @property
+    def available_attributes(self) -> frozenset:
+        """
+        VALUE_ATTRIBUTES for which at least one point has a value
+        
+        Worked out by materialize() when a track is loaded, then kept (with
+        has_values()) until the points change.
+        """
+        return frozenset(attribute for attribute in self.VALUE_ATTRIBUTES
+                         if self.has_values(attribute))
+    
+    def materialize(self):
+        """
+        Build the commonly scanned column arrays (and elapsed times) up front
+        
+        Parsers call this once a track is complete, so that later scans
+        (bounds, distances, averaging, viewers) work on contiguous arrays and
+        the available attributes are known.
+        """
+        for attribute in self.MATERIALIZED_COLUMNS:
+            self.column(attribute)
+        # Both fill their caches (elapsed times, has_values) as they are read
+        _ = self.elapsed_time
+        _ = self.available_attributes
+    
+    def invalidate_columns(self, *attributes: str):
+        """
+        Drop cached attribute arrays after point values were modified in place
+        
+        Args:
+            *attributes: Attributes that changed (all cached arrays if none given)
+        """
+        if not attributes:
+            self._columns.clear()
+            self._has_values.clear()
+        for attribute in attributes:
+            self._columns.pop(attribute, None)
+            self._has_values.pop(attribute, None)
+        if 'latitude' in attributes or 'longitude' in attributes:
+            # Also drop the arrays derived from the coordinates
+            derived = [key for key in self._columns
+                       if key in _COORDINATE_KEYS or key.startswith('rdp:')]
+            for key in derived:
+                del self._columns[key]
+        if 'timestamp' in attributes:
+            # Also drop the arrays derived from the timestamps
+            derived = [key for key in self._columns
+                       if key in _TIME_KEYS or key.startswith('window:')]
+            for key in derived:
+                del self._columns[key]
+        if not attributes or 'latitude' in attributes or 'longitude' in attributes:
+            self._bounds = None
+    
+    @property
+    def lat(self) -> np.ndarray:
+        """Latitudes of all points"""
+        return self.column('latitude')
+    
+    @property
+    def lon(self) -> np.ndarray:
+        """Longitudes of all points"""
+        return self.column('longitude')
+    
+    @property
+    def elev(self) -> np.ndarray:
+        """Altitudes of all points (NaN where missing)"""
+        return self.column('altitude')
+    
+    @property
+    def elapsed_time(self) -> np.ndarray:
+        """Seconds since the first timestamped point (NaN where missing)"""
+        values = self._columns.get('elapsed_time')
+        if values is None:
+            values = self._elapsed_microseconds() / 1e6
+            self._columns['elapsed_time'] = values
+        return values
+    
+    def _elapsed_microseconds(self) -> np.ndarray:
+        """
+        Whole microseconds since the first timestamped point (NaN where missing)
+        
+        Stored exactly as floats, so that differences between points equal the
+        timedelta between their timestamps.
+        """
+        values = self._columns.get('elapsed_us')
+        if values is None:
+            start = next((p.timestamp for p in self.points if p.timestamp is not None), None)
+            values = np.fromiter(
+                (np.nan if p.timestamp is None else (p.timestamp - start) // _MICROSECOND
+                 for p in self.points),
+                dtype=np.float64, count=len(self.points)
+            )
+            self._columns['elapsed_us'] = values
+        return values
+    
+    def time_deltas(self) -> np.ndarray:
+        """
+        Seconds from each point to the next (NaN where a timestamp is missing)
+        
+        Equal to the timedelta between the two timestamps, in seconds.
+        """
+        times = self._elapsed_microseconds()
+        return (times[1:] - times[:-1]) / 1e6
+    
+    def latlng_array(self) -> np.ndarray:
+        """
+        All points as an (N, 2) array of latitude, longitude rows
+        
+        The array is cached until the points change and must not be modified
+        by the caller.
+        """
+        values = self._columns.get('latlng')
+        if values is None:
+            values = np.column_stack((self.lat, self.lon))
+            self._columns['latlng'] = values
+        return values
+    
+    def latlngs(self, decimals: Optional[int] = None) -> list:
+        """
+        All points as [lat, lng] pairs for mapping libraries
+        
+        Args:
+            decimals: Decimal places coordinates are rounded to (None keeps them exact)
+        """
+        return self._pairs(self.latlng_array(), decimals)
+    
+    def simplified_latlngs(self, epsilon: float, decimals: Optional[int] = None) -> list:
+        """
+        [lat, lng] pairs of the track simplified with Ramer-Douglas-Peucker
+        
+        Args:
+            epsilon: Tolerance in degrees (cached per value until the points change)
+            decimals: Decimal places coordinates are rounded to (None keeps them exact)
+        """
+        key = f'rdp:{epsilon}'
+        indices = self._columns.get(key)
+        if indices is None:
+            indices = rdp_indices(self.lat, self.lon, epsilon)
+            self._columns[key] = indices
+        return self._pairs(self.latlng_array()[indices], decimals)
+    
+    @staticmethod
+    def _pairs(values: np.ndarray, decimals: Optional[int]) -> list:
+        """Coordinate rows as lists, rounded to shorten their text form"""
+        if decimals is not None:
+            values = np.round(values, decimals)
+        return values.tolist()
     
     def get_bounds(self):
-        """Calculate bounding box of the track"""
+        """Calculate bounding box of the track (cached until the points change)"""
         if not self.points:
             return None
         
-        lats = [p.latitude for p in self.points]
-        lngs = [p.longitude for p in self.points]
-        
-        return {
-            'min_lat': min(lats),
-            'max_lat': max(lats),
-            'min_lng': min(lngs),
-            'max_lng': max(lngs)
-        }
+        if self._bounds is None:
+            lats = self.lat
+            lngs = self.lon
+            self._bounds = {
+                'min_lat': float(lats.min()),
+                'max_lat': float(lats.max()),
+                'min_lng': float(lngs.min()),
+                'max_lng': float(lngs.max())
+            }
+        
+        # Copy so that callers cannot alter the cached bounds
+        return dict(self._bounds)
     
     def get_center(self):
         """Calculate center point of the track"""
@@ -80,72 +383,86 @@ class Track:
         center_lng = (bounds['min_lng'] + bounds['max_lng']) / 2
         return [center_lat, center_lng]
     
+    def _radians(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Latitudes and longitudes in radians and the cosine of the latitudes (cached)"""
+        if 'cos_lat' not in self._columns:
+            lat = np.radians(self.lat)
+            self._columns['lat_rad'] = lat
+            self._columns['lng_rad'] = np.radians(self.lon)
+            self._columns['cos_lat'] = np.cos(lat)
+        return self._columns['lat_rad'], self._columns['lng_rad'], self._columns['cos_lat']
+    
+    def segment_distances(self) -> np.ndarray:
+        """Haversine distance in kilometers between each pair of consecutive points"""
+        lat, lng, cos_lat = self._radians()
+        dlat = lat[1:] - lat[:-1]
+        dlon = lng[1:] - lng[:-1]
+        sin_dlat = np.sin(dlat * 0.5)
+        sin_dlon = np.sin(dlon * 0.5)
+        a = sin_dlat * sin_dlat + cos_lat[:-1] * cos_lat[1:] * (sin_dlon * sin_dlon)
+        return 2 * (EARTH_RADIUS_M / 1000) * np.arcsin(np.sqrt(a))
+    
+    def cumulative_distances(self) -> np.ndarray:
+        """
+        Distance in kilometers from the first point to each point
+        
+        The array is cached until the points change and must not be modified
+        by the caller.
+        """
+        values = self._columns.get('cumulative_distance')
+        if values is None:
+            values = np.concatenate(([0.0], np.cumsum(self.segment_distances())))
+            self._columns['cumulative_distance'] = values
+        return values
+    
     def get_total_distance(self):
         """Calculate total distance in kilometers (simplified)"""
         if len(self.points) < 2:
             return 0.0
         
-        from math import radians, cos, sin, asin, sqrt
+        return float(self.segment_distances().sum())
+    
+    def calculate_vertical_speeds(self):
+        """Calculate vertical speed between consecutive points from altitude changes"""
+        if len(self.points) < 2:
+            return
+        
+        altitudes = self.column('altitude')
+        time_diffs = self.time_deltas()
         
-        total = 0.0
-        for i in range(len(self.points) - 1):
-            p1 = self.points[i]
-            p2 = self.points[i + 1]
-            
-            # Haversine formula
-            lon1, lat1, lon2, lat2 = map(radians, [p1.longitude, p1.latitude, 
-                                                     p2.longitude, p2.latitude])
-            dlon = lon2 - lon1
-            dlat = lat2 - lat1
-            a = sin(dlat/2)**2 + cos(lat1) * cos(lat2) * sin(dlon/2)**2
-            c = 2 * asin(sqrt(a))
-            r = 6371  # Radius of earth in kilometers
-            total += c * r
-        
-        return total
+        # Only where both altitudes are known and time moves forward
+        with np.errstate(divide='ignore', invalid='ignore'):
+            speeds_ms = np.where(time_diffs > 0, (altitudes[1:] - altitudes[:-1]) / time_diffs, np.nan)
+        speeds_ms = np.concatenate(([np.nan], speeds_ms))
+        
+        self._store_values('vertical_speed_ms', speeds_ms)
+        self._store_values('vertical_speed_mh', speeds_ms * 3600)
     
     def calculate_speed(self):
         """Calculate speed for points that don't have it, using Haversine formula"""
         if len(self.points) < 2:
             return
         
-        from math import radians, cos, sin, asin, sqrt
+        speeds = self.column('speed')
+        times = self.elapsed_time
         
         # Check if any points need speed calculation
-        needs_calculation = any(p.speed is None and p.timestamp is not None 
-                               for p in self.points)
-        
-        if not needs_calculation:
+        if not (np.isnan(speeds) & ~np.isnan(times)).any():
             return
         
-        # Calculate speed between consecutive points
-        for i in range(1, len(self.points)):
-            p1 = self.points[i - 1]
-            p2 = self.points[i]
-            
-            # Only calculate if speed is missing and we have timestamps
-            if p2.speed is None and p1.timestamp is not None and p2.timestamp is not None:
-                # Calculate time difference in seconds
-                time_diff = (p2.timestamp - p1.timestamp).total_seconds()
-                
-                if time_diff > 0:
-                    # Haversine formula for distance
-                    lon1, lat1, lon2, lat2 = map(radians, [p1.longitude, p1.latitude, 
-                                                             p2.longitude, p2.latitude])
-                    dlon = lon2 - lon1
-                    dlat = lat2 - lat1
-                    a = sin(dlat/2)**2 + cos(lat1) * cos(lat2) * sin(dlon/2)**2
-                    c = 2 * asin(sqrt(a))
-                    r = 6371000  # Radius of earth in meters
-                    distance = c * r
-                    
-                    # Speed in m/s, then convert to km/h
-                    speed_ms = distance / time_diff
-                    p2.speed = speed_ms * 3.6  # Convert to km/h
+        # Calculate speed between consecutive points, only where speed is
+        # missing and both timestamps are known
+        segment_speeds = _segment_speeds(*self._radians(), times)
+        missing = np.isnan(speeds[1:]) & ~np.isnan(segment_speeds)
+        
+        for i in np.flatnonzero(missing):
+            self.points[i + 1].speed = float(segment_speeds[i])
         
         # Set first point's speed to second point's speed if available
         if self.points[0].speed is None and len(self.points) > 1 and self.points[1].speed is not None:
             self.points[0].speed = self.points[1].speed
+        
+        self.invalidate_columns('speed')
     
     def apply_window_averaging(self):
         """Apply window averaging to vertical speed field only"""
@@ -155,142 +472,112 @@ class Track:
         # Average vertical speed over 15 seconds
         self._average_vertical_speed(window_seconds=15)
     
-    def _average_power(self, window_seconds: float):
-        """Average power values over a time window using efficient sliding window"""
-        if not self.points or not any(p.power is not None and p.timestamp is not None for p in self.points):
-            return
+    def _window_bounds(self, window_seconds: float) -> np.ndarray:
+        """
+        Time windows centered on each timestamped point
         
-        # Store original values
-        original_powers = [p.power for p in self.points]
-        half_window = window_seconds / 2
+        A window extends from its point, among the timestamped points, until
+        a point more than half the window away in time. Bounds are found with
+        searchsorted when the timestamps never go back, by _scan_window_bounds
+        otherwise. They only depend on the timestamps, so they are cached per
+        window width and shared by all averaged attributes.
         
-        for i, point in enumerate(self.points):
-            if point.power is None or point.timestamp is None:
-                continue
-            
-            # Find window boundaries using binary search-like approach
-            window_sum = 0.0
-            window_count = 0
-            
-            # Search backward from current point
-            for j in range(i, -1, -1):
-                other = self.points[j]
-                if other.timestamp is None:
-                    continue
-                time_diff = abs((point.timestamp - other.timestamp).total_seconds())
-                if time_diff > half_window:
-                    break
-                if original_powers[j] is not None:
-                    window_sum += original_powers[j]
-                    window_count += 1
-            
-            # Search forward from current point (skip current point to avoid double counting)
-            for j in range(i + 1, len(self.points)):
-                other = self.points[j]
-                if other.timestamp is None:
-                    continue
-                time_diff = abs((point.timestamp - other.timestamp).total_seconds())
-                if time_diff > half_window:
-                    break
-                if original_powers[j] is not None:
-                    window_sum += original_powers[j]
-                    window_count += 1
-            
-            # Calculate average
-            if window_count > 0:
-                point.power = window_sum / window_count
+        Returns:
+            Array of 3 rows: timestamped point indices, and the start and
+            (exclusive) end of each window among those points
+        """
+        key = f'window:{window_seconds}'
+        bounds = self._columns.get(key)
+        if bounds is None:
+            # Whole microseconds, exact like the timestamp differences
+            times = self._elapsed_microseconds()
+            indices = np.flatnonzero(~np.isnan(times))
+            t = times[indices]
+            half_window = window_seconds / 2 * 1e6
+            if (np.diff(t) >= 0).all():
+                lo = np.searchsorted(t, t - half_window, side='left')
+                hi = np.searchsorted(t, t + half_window, side='right')
+            else:
+                lo, hi = _scan_window_bounds(t, half_window)
+            bounds = np.vstack((indices, lo, hi))
+            self._columns[key] = bounds
+        return bounds
     
-    def _average_vertical_speed(self, window_seconds: float):
-        """Average vertical speed values over a time window using efficient sliding window"""
-        if not self.points or not any(p.vertical_speed_mh is not None and p.timestamp is not None for p in self.points):
-            return
+    def _window_average(self, values: np.ndarray, window_seconds: float) -> np.ndarray:
+        """
+        Average values over a time window centered on each point
         
-        # Store original values
-        original_vspeeds = [p.vertical_speed_mh for p in self.points]
-        half_window = window_seconds / 2
+        Window sums and counts of the non-missing values come from prefix sums
+        over the window bounds of _window_bounds().
         
-        for i, point in enumerate(self.points):
-            if point.vertical_speed_mh is None or point.timestamp is None:
-                continue
-            
-            # Find window boundaries
-            window_sum = 0.0
-            window_count = 0
-            
-            # Search backward from current point
-            for j in range(i, -1, -1):
-                other = self.points[j]
-                if other.timestamp is None:
-                    continue
-                time_diff = abs((point.timestamp - other.timestamp).total_seconds())
-                if time_diff > half_window:
-                    break
-                if original_vspeeds[j] is not None:
-                    window_sum += original_vspeeds[j]
-                    window_count += 1
-            
-            # Search forward from current point
-            for j in range(i + 1, len(self.points)):
-                other = self.points[j]
-                if other.timestamp is None:
-                    continue
-                time_diff = abs((point.timestamp - other.timestamp).total_seconds())
-                if time_diff > half_window:
-                    break
-                if original_vspeeds[j] is not None:
-                    window_sum += original_vspeeds[j]
-                    window_count += 1
+        Args:
+            values: One value per point, NaN where missing
+            window_seconds: Total window width
             
-            # Calculate average
-            if window_count > 0:
-                point.vertical_speed_mh = window_sum / window_count
-                # Also update m/s value
-                point.vertical_speed_ms = point.vertical_speed_mh / 3600
+        Returns:
+            Averages per point, NaN where the point has no value or timestamp
+        """
+        indices, lo, hi = self._window_bounds(window_seconds)
+        averages = np.full(len(values), np.nan)
+        v = values[indices]
+        
+        present = ~np.isnan(v)
+        value_sums = np.concatenate(([0.0], np.cumsum(np.where(present, v, 0.0))))
+        value_counts = np.concatenate(([0], np.cumsum(present)))
+        
+        # Each window holds its own point, so a point with a value counts at least once
+        lo, hi = lo[present], hi[present]
+        averages[indices[present]] = ((value_sums[hi] - value_sums[lo])
+                                      / (value_counts[hi] - value_counts[lo]))
+        
+        return averages
     
-    def _average_speed(self, window_seconds: float):
-        """Average speed values over a time window using efficient sliding window"""
-        if not self.points or not any(p.speed is not None and p.timestamp is not None for p in self.points):
-            return
+    def _store_values(self, attribute: str, values: np.ndarray):
+        """
+        Write values to an attribute of the points, skipping NaN values
+        
+        The cached column is updated rather than rebuilt from the points.
+        """
+        column = self.column(attribute)
+        present = np.flatnonzero(~np.isnan(values))
+        points = self.points
+        for i, value in zip(present.tolist(), values[present].tolist()):
+            setattr(points[i], attribute, value)
+        self._columns[attribute] = np.where(np.isnan(values), column, values)
+        self._has_values.pop(attribute, None)
+    
+    def _average_attribute(self, attribute: str, window_seconds: float) -> Optional[np.ndarray]:
+        """
+        Replace an attribute of all points by its window average
         
-        # Store original values
-        original_speeds = [p.speed for p in self.points]
-        half_window = window_seconds / 2
+        Returns:
+            The averages (NaN where not averaged), or None if no point has
+            both the attribute and a timestamp
+        """
+        if not self.has_values(attribute):
+            return None
+        values = self.column(attribute)
+        if not (~np.isnan(values) & ~np.isnan(self.elapsed_time)).any():
+            return None
         
-        for i, point in enumerate(self.points):
-            if point.speed is None or point.timestamp is None:
-                continue
-            
-            # Find window boundaries
-            window_sum = 0.0
-            window_count = 0
-            
-            # Search backward from current point
-            for j in range(i, -1, -1):
-                other = self.points[j]
-                if other.timestamp is None:
-                    continue
-                time_diff = abs((point.timestamp - other.timestamp).total_seconds())
-                if time_diff > half_window:
-                    break
-                if original_speeds[j] is not None:
-                    window_sum += original_speeds[j]
-                    window_count += 1
-            
-            # Search forward from current point
-            for j in range(i + 1, len(self.points)):
-                other = self.points[j]
-                if other.timestamp is None:
-                    continue
-                time_diff = abs((point.timestamp - other.timestamp).total_seconds())
-                if time_diff > half_window:
-                    break
-                if original_speeds[j] is not None:
-                    window_sum += original_speeds[j]
-                    window_count += 1
-            
-            # Calculate average
-            if window_count > 0:
-                point.speed = window_sum / window_count
+        averages = self._window_average(values, window_seconds)
+        self._store_values(attribute, averages)
+        return averages
+    
+    def _average_power(self, window_seconds: float):
+        """Average power values over a time window"""
+        self._average_attribute('power', window_seconds)
+    
+    def _average_vertical_speed(self, window_seconds: float):
+        """Average vertical speed values over a time window"""
+        averages = self._average_attribute('vertical_speed_mh', window_seconds)
+        if averages is not None:
+            # Also update m/s values
+            self._store_values('vertical_speed_ms', averages / 3600)
+    
+    def _average_speed(self, window_seconds: float):
+        """Average speed values over a time window"""
+        self._average_attribute('speed', window_seconds)
     
     def calculate_power_curve(self, pause_threshold_seconds: float = 900.0):
         """
@@ -301,8 +588,8 @@ class Track:
             pause_threshold_seconds: Time gap to consider as a pause (default 5s)
         """
         # Check if track has power data
-        if not any(p.power is not None and p.power > 0 and p.timestamp is not None 
-                   for p in self.points):
+        if not self.has_values('power') or \
+           not ((self.column('power') > 0) & ~np.isnan(self.elapsed_time)).any():
             self.power_curve = None
             return
         
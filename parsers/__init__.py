@@ -1,7 +1,32 @@
 """Parsers package"""
 
+import os
+from typing import Optional
+
+from models.track import Track
 from .gpx_parser import GPXParser
 from .igc_parser import IGCParser
 from .tcx_parser import TCXParser
 
-__all__ = ['GPXParser', 'IGCParser', 'TCXParser']
+# Parser class for each supported file extension
+PARSERS = {
+    '.gpx': GPXParser,
+    '.igc': IGCParser,
+    '.tcx': TCXParser,
+}
+
+
+def parse_track_file(file_path: str) -> Optional[Track]:
+    """
+    Parse a track file with the parser matching its extension
+    
+    Returns:
+        The parsed Track, or None if the file type is not supported
+    """
+    parser_class = PARSERS.get(os.path.splitext(file_path)[1].lower())
+    if parser_class is None:
+        return None
+    return parser_class().parse(file_path)
+
+
+__all__ = ['GPXParser', 'IGCParser', 'TCXParser', 'PARSERS', 'parse_track_file']
@@ -2,10 +2,50 @@
 GPX file parser for bike tracks
 """
 
-import gpxpy
 import os
+import re
+import xml.etree.ElementTree as ET
+from datetime import datetime, timedelta, timezone
 from models.track import Track, TrackPoint
 
+# Point elements, in the order they are looked for
+POINT_TAGS = ('trkpt', 'rtept', 'wpt')
+
+
+# xsd:dateTime as written in GPX files, the fraction and zone being optional
+TIME_PATTERN = re.compile(
+    r'(\d{4})-(\d{1,2})-(\d{1,2})[T ](\d{1,2}):(\d{1,2}):(\d{1,2})'
+    r'(?:\.(\d+))?(Z|[+-]\d{2}(?::?\d{2})?)?')
+
+
+def _parse_time(text: str) -> datetime:
+    """
+    Datetime of a GPX time element
+
+    Unlike datetime.fromisoformat before Python 3.11, accepts fractional
+    seconds of any length (kept to the microsecond) and zones without colon.
+    """
+    match = TIME_PATTERN.fullmatch(text)
+    if match is None:
+        raise ValueError(f"Invalid GPX time: {text!r}")
+    year, month, day, hour, minute, second, fraction, zone = match.groups()
+    microsecond = int((fraction or '')[:6].ljust(6, '0'))
+    tzinfo = None
+    if zone == 'Z':
+        tzinfo = timezone.utc
+    elif zone:
+        sign = -1 if zone[0] == '-' else 1
+        digits = zone[1:].replace(':', '')
+        offset = timedelta(hours=int(digits[:2]), minutes=int(digits[2:] or 0))
+        tzinfo = timezone(sign * offset)
+    return datetime(int(year), int(month), int(day), int(hour), int(minute),
+                    int(second), microsecond, tzinfo=tzinfo)
+
+
+def _local_name(tag: str) -> str:
+    """Element tag without its namespace"""
+    return tag.rpartition('}')[2]
+
 
 class GPXParser:
     """Parser for GPX format files"""
@@ -20,35 +60,38 @@ class GPXParser:
         Returns:
             Track object containing parsed data
         """
-        with open(file_path, 'r', encoding='utf-8') as gpx_file:
-            gpx = gpxpy.parse(gpx_file)
-        
         # Use filename as track name
         track_name = os.path.basename(file_path)
         track = Track(name=track_name, track_type='gpx')
         
-        # Extract points from all tracks and segments
-        for gpx_track in gpx.tracks:
-            for segment in gpx_track.segments:
-                for point in segment.points:
-                    track_point = self._create_track_point(point)
-                    track.add_point(track_point)
+        points = {tag: [] for tag in POINT_TAGS}
+        version = None
+        parents = []
         
-        # If no tracks, try routes
-        if len(track) == 0:
-            for route in gpx.routes:
-                for point in route.points:
-                    track_point = self._create_track_point(point)
-                    track.add_point(track_point)
+        # Stream the file, dropping each point element once it is converted
+        for event, elem in ET.iterparse(file_path, events=('start', 'end')):
+            if event == 'start':
+                if version is None:
+                    version = elem.get('version', '1.0')
+                parents.append(elem)
+                continue
+            
+            parents.pop()
+            tag = _local_name(elem.tag)
+            if tag in points:
+                points[tag].append(self._create_track_point(elem, version))
+                elem.clear()
+                if parents:
+                    parents[-1].remove(elem)
         
-        # If still no points, try waypoints
-        if len(track) == 0:
-            for point in gpx.waypoints:
-                track_point = self._create_track_point(point)
-                track.add_point(track_point)
+        # Track points from all tracks and segments, else routes, else waypoints
+        for tag in POINT_TAGS:
+            if points[tag]:
+                track.extend(points[tag])
+                break
         
         # Calculate vertical speeds
-        self._calculate_vertical_speeds(track)
+        track.calculate_vertical_speeds()
         
         # Calculate speed if not present
         track.calculate_speed()
@@ -59,21 +102,44 @@ class GPXParser:
         # Calculate power curve if power data is available
         track.calculate_power_curve()
         
+        # Build the column arrays used when displaying the track
+        track.materialize()
+        
         return track
     
-    def _create_track_point(self, gpx_point) -> TrackPoint:
-        """Create TrackPoint from gpxpy point with all available extensions"""
+    def _create_track_point(self, point_elem: ET.Element, version: str) -> TrackPoint:
+        """Create TrackPoint from a GPX point element with all available extensions"""
+        altitude = None
+        timestamp = None
+        speed = None
+        extensions = []
+        # Only GPX 1.0 track points define a speed element, only GPX 1.1 extensions
+        has_speed = version == '1.0' and _local_name(point_elem.tag) == 'trkpt'
+        has_extensions = version != '1.0'
+        
+        for child in point_elem:
+            name = _local_name(child.tag)
+            text = child.text.strip() if child.text else ''
+            if name == 'ele' and text:
+                altitude = float(text)
+            elif name == 'time' and text:
+                timestamp = _parse_time(text)
+            elif name == 'speed' and text and has_speed:
+                speed = float(text)
+            elif name == 'extensions' and has_extensions:
+                extensions = list(child)
+        
         track_point = TrackPoint(
-            latitude=gpx_point.latitude,
-            longitude=gpx_point.longitude,
-            altitude=gpx_point.elevation,
-            timestamp=gpx_point.time,
-            speed=gpx_point.speed
+            latitude=float(point_elem.get('lat')),
+            longitude=float(point_elem.get('lon')),
+            altitude=altitude,
+            timestamp=timestamp,
+            speed=speed
         )
         
         # Extract extension data if available
-        if hasattr(gpx_point, 'extensions') and gpx_point.extensions:
-            for ext in gpx_point.extensions:
+        if extensions:
+            for ext in extensions:
                 # Try different approaches to find extension elements
                 
                 # Approach 1: Direct child elements with namespace
@@ -161,21 +227,3 @@ class GPXParser:
             track_point.cadence = 0
         
         return track_point
-    
-    def _calculate_vertical_speeds(self, track: Track):
-        """Calculate vertical speed between consecutive points"""
-        for i in range(1, len(track.points)):
-            p1 = track.points[i - 1]
-            p2 = track.points[i]
-            
-            if p1.altitude is not None and p2.altitude is not None and \
-               p1.timestamp is not None and p2.timestamp is not None:
-                
-                # Calculate time difference in seconds
-                time_diff = (p2.timestamp - p1.timestamp).total_seconds()
-                
-                if time_diff > 0:
-                    # Calculate vertical speed in m/s and m/h
-                    alt_diff = p2.altitude - p1.altitude
-                    p2.vertical_speed_ms = alt_diff / time_diff
-                    p2.vertical_speed_mh = p2.vertical_speed_ms * 3600
@@ -2,10 +2,33 @@
 IGC file parser for paragliding tracks
 """
 
+import mmap
 import os
 from datetime import datetime, date
+from typing import List, Optional
+
+import numpy as np
+
 from models.track import Track, TrackPoint
 
+# Length of the fixed part of a B record, up to the GPS altitude
+B_RECORD_LENGTH = 35
+
+# Offsets of the digits in the fixed part of a B record
+_DIGIT_COLUMNS = np.r_[1:14, 15:23, 26:30, 31:35]
+# Altitudes may be negative, their first character being a minus sign
+_ALTITUDE_COLUMNS = (25, 30)
+
+# Coordinate sign for each possible hemisphere byte
+_LAT_SIGN = np.ones(256)
+_LAT_SIGN[ord('S')] = -1.0
+_LON_SIGN = np.ones(256)
+_LON_SIGN[ord('W')] = -1.0
+
+# First bytes of lines that must be decoded to know their record type:
+# whitespace stripped from the line, or non-ASCII bytes
+_DECODE_FIRST = np.array([chr(b).isspace() or b >= 128 for b in range(256)])
+
 
 class IGCParser:
     """Parser for IGC format files (paragliding)"""
@@ -23,24 +46,36 @@ class IGCParser:
         track_name = os.path.basename(file_path)
         track = Track(name=track_name, track_type='igc')
         
-        flight_date = None
-        
-        with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-            for line in f:
-                line = line.strip()
-                
-                # HFDTE record contains the date
-                if line.startswith('HFDTE') or line.startswith('HFDTEDATE:'):
-                    flight_date = self._parse_date(line)
-                
-                # B record contains position fixes
-                elif line.startswith('B'):
-                    point = self._parse_b_record(line, flight_date)
-                    if point:
-                        track.add_point(point)
+        buf = self._read_file(file_path)
+        
+        # Line boundaries, a line ending with '\n', '\r\n' or '\r'
+        breaks = np.flatnonzero((buf == ord('\n')) | (buf == ord('\r')))
+        starts = np.concatenate(([0], breaks + 1))
+        ends = np.concatenate((breaks, [len(buf)]))
+        non_empty = ends > starts
+        starts, ends = starts[non_empty], ends[non_empty]
+        first = buf[starts]
+        
+        # Only header and unusual lines are decoded; B records are read as bytes
+        decoded = {i: self._line_text(buf, starts[i], ends[i])
+                   for i in np.flatnonzero(_DECODE_FIRST[first] | (first == ord('H'))).tolist()}
+        
+        # HFDTE records contain the date, B records the position fixes
+        date_lines = [i for i, line in decoded.items() if line.startswith('HFDTE')]
+        b_lines = np.union1d(np.flatnonzero(first == ord('B')),
+                             [i for i, line in decoded.items() if line.startswith('B')])
+        b_lines = b_lines.astype(np.intp)
+        
+        # Each fix uses the date of the last HFDTE record preceding it
+        dates = [self._parse_date(decoded[i]) for i in date_lines]
+        date_index = np.searchsorted(date_lines, b_lines) - 1
+        flight_dates = [dates[j] if j >= 0 else None for j in date_index.tolist()]
+        
+        points = self._parse_b_records(buf, starts[b_lines], ends[b_lines], flight_dates)
+        track.extend(point for point in points if point)
         
         # Calculate vertical speeds
-        self._calculate_vertical_speeds(track)
+        track.calculate_vertical_speeds()
         
         # Calculate speed if not present
         track.calculate_speed()
@@ -48,26 +83,11 @@ class IGCParser:
         # Apply window averaging for power and vertical speed
         track.apply_window_averaging()
         
+        # Build the column arrays used when displaying the track
+        track.materialize()
+        
         return track
     
-    def _calculate_vertical_speeds(self, track: Track):
-        """Calculate vertical speed between consecutive points"""
-        for i in range(1, len(track.points)):
-            p1 = track.points[i - 1]
-            p2 = track.points[i]
-            
-            if p1.altitude is not None and p2.altitude is not None and \
-               p1.timestamp is not None and p2.timestamp is not None:
-                
-                # Calculate time difference in seconds
-                time_diff = (p2.timestamp - p1.timestamp).total_seconds()
-                
-                if time_diff > 0:
-                    # Calculate vertical speed in m/s and m/h
-                    alt_diff = p2.altitude - p1.altitude
-                    p2.vertical_speed_ms = alt_diff / time_diff
-                    p2.vertical_speed_mh = p2.vertical_speed_ms * 3600
-    
     def _parse_date(self, line: str) -> date:
         """Parse date from HFDTE record"""
         # Format: HFDTEDDMMYYor HFDTEDDMMYY
@@ -89,6 +109,97 @@ class IGCParser:
         
         return None
     
+    @staticmethod
+    def _read_file(file_path: str) -> np.ndarray:
+        """Memory-map the file and return its bytes as an array"""
+        with open(file_path, 'rb') as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return np.zeros(0, dtype=np.uint8)
+            # The array keeps the mapping alive, it is unmapped once unreferenced
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return np.frombuffer(data, dtype=np.uint8)
+    
+    @staticmethod
+    def _line_text(buf: np.ndarray, start: int, end: int) -> str:
+        """Decode one line of the file, stripped"""
+        return buf[start:end].tobytes().decode('utf-8', errors='ignore').strip()
+    
+    def _parse_b_records(self, buf: np.ndarray, starts: np.ndarray, ends: np.ndarray,
+                         flight_dates: List[Optional[date]]) -> List[Optional[TrackPoint]]:
+        """
+        Parse B records in bulk
+        
+        The fixed-width fields of well-formed records are decoded all at once
+        from the file bytes; any other record goes through _parse_b_record.
+        
+        Args:
+            buf: File bytes
+            starts, ends: Byte range of each B record line
+            flight_dates: Date applying to each record (or None)
+            
+        Returns:
+            One TrackPoint (or None for invalid records) per line
+        """
+        points = [None] * len(starts)
+        fixed = np.flatnonzero(ends - starts >= B_RECORD_LENGTH)
+        
+        # One row of bytes per record
+        records = buf[starts[fixed, None] + np.arange(B_RECORD_LENGTH)]
+        digits = records.astype(np.int64) - ord('0')
+        
+        def field(start, end):
+            value = np.zeros(len(records), dtype=np.int64)
+            for col in range(start, end):
+                value = value * 10 + digits[:, col]
+            return value
+        
+        # Digits everywhere, except for an optional minus sign leading the altitudes
+        is_digit = (digits >= 0) & (digits <= 9)
+        is_minus = records == ord('-')
+        altitude_ok = np.all(is_digit[:, _ALTITUDE_COLUMNS] | is_minus[:, _ALTITUDE_COLUMNS], axis=1)
+        
+        hours, minutes, seconds = field(1, 3), field(3, 5), field(5, 7)
+        valid = ((records[:, 0] == ord('B')) & np.all(records < 128, axis=1)
+                 & np.all(is_digit[:, _DIGIT_COLUMNS], axis=1) & altitude_ok
+                 & (hours < 24) & (minutes < 60) & (seconds < 60))
+        
+        latitudes = field(7, 9) + (field(9, 11) + field(11, 14) / 1000.0) / 60.0
+        latitudes *= _LAT_SIGN[records[:, 14]]
+        longitudes = field(15, 18) + (field(18, 20) + field(20, 23) / 1000.0) / 60.0
+        longitudes *= _LON_SIGN[records[:, 23]]
+        pressure_alts = np.where(is_minus[:, 25], -field(26, 30), field(25, 30))
+        gps_alts = np.where(is_minus[:, 30], -field(31, 35), field(30, 35))
+        
+        columns = zip(fixed.tolist(), valid.tolist(), latitudes.tolist(), longitudes.tolist(),
+                      pressure_alts.tolist(), gps_alts.tolist(),
+                      hours.tolist(), minutes.tolist(), seconds.tolist())
+        for i, ok, latitude, longitude, pressure_alt, gps_alt, hour, minute, second in columns:
+            if not ok:
+                points[i] = self._parse_b_record(self._line_text(buf, starts[i], ends[i]),
+                                                 flight_dates[i])
+                continue
+            
+            flight_date = flight_dates[i]
+            timestamp = None
+            if flight_date:
+                timestamp = datetime(flight_date.year, flight_date.month, flight_date.day,
+                                     hour, minute, second)
+            
+            points[i] = TrackPoint(
+                latitude=latitude,
+                longitude=longitude,
+                altitude=gps_alt,
+                pressure_altitude=pressure_alt,
+                timestamp=timestamp
+            )
+        
+        # Lines too short for the fixed layout
+        for i in np.flatnonzero(ends - starts < B_RECORD_LENGTH).tolist():
+            points[i] = self._parse_b_record(self._line_text(buf, starts[i], ends[i]),
+                                             flight_dates[i])
+        
+        return points
+    
     def _parse_b_record(self, line: str, flight_date: date = None) -> TrackPoint:
         """
         Parse B record (position fix)
@@ -134,11 +245,8 @@ class IGCParser:
             # Create timestamp if we have the date
             timestamp = None
             if flight_date:
-                timestamp = datetime.combine(flight_date, 
-                                            datetime.min.time().replace(
-                                                hour=hours, 
-                                                minute=minutes, 
-                                                second=seconds))
+                timestamp = datetime(flight_date.year, flight_date.month, flight_date.day,
+                                     hours, minutes, seconds)
             
             return TrackPoint(
                 latitude=latitude,
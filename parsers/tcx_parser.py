@@ -35,6 +35,7 @@ class TCXParser:
         }
         
         # Extract trackpoints from all laps
+        points = []
         for trackpoint in root.findall('.//tcx:Trackpoint', ns):
             # Get position data
             position = trackpoint.find('tcx:Position', ns)
@@ -93,10 +94,12 @@ class TCXParser:
                 if power_elem is not None and power_elem.text:
                     track_point.power = float(power_elem.text)
             
-            track.add_point(track_point)
+            points.append(track_point)
+        
+        track.extend(points)
         
         # Calculate vertical speeds
-        self._calculate_vertical_speeds(track)
+        track.calculate_vertical_speeds()
         
         # Calculate speed if not present
         track.calculate_speed()
@@ -107,22 +110,7 @@ class TCXParser:
         # Calculate power curve if power data is available
         track.calculate_power_curve()
         
+        # Build the column arrays used when displaying the track
+        track.materialize()
+        
         return track
-    
-    def _calculate_vertical_speeds(self, track: Track):
-        """Calculate vertical speed between consecutive points"""
-        for i in range(1, len(track.points)):
-            p1 = track.points[i - 1]
-            p2 = track.points[i]
-            
-            if p1.altitude is not None and p2.altitude is not None and \
-               p1.timestamp is not None and p2.timestamp is not None:
-                
-                # Calculate time difference in seconds
-                time_diff = (p2.timestamp - p1.timestamp).total_seconds()
-                
-                if time_diff > 0:
-                    # Calculate vertical speed in m/s and m/h
-                    alt_diff = p2.altitude - p1.altitude
-                    p2.vertical_speed_ms = alt_diff / time_diff
-                    p2.vertical_speed_mh = p2.vertical_speed_ms * 3600
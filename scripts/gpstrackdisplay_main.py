@@ -14,6 +14,10 @@ def main():
     QApplication.setAttribute(Qt.AA_ShareOpenGLContexts)
 
     from apps.combined_app import CombinedWindow
+    from ui.gzip_scheme import register_gzip_scheme
+
+    # Custom URL schemes must be known before the application is created
+    register_gzip_scheme()
 
     app = QApplication(sys.argv)
     app.setStyle('Fusion')
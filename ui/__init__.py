@@ -1,7 +1,11 @@
 """UI package"""
 
 from .file_selector import FileSelector
+from .gzip_scheme import GzipSchemeHandler, register_gzip_scheme
+from .map_view_bridge import MapViewBridge
+from .screenshot_writer import ScreenshotWriter
 from .track_list_item import TrackListItem
 from .track_manager_widget import TrackManagerWidget
+from .web_profile import shared_profile
 
-__all__ = ['FileSelector', 'TrackListItem', 'TrackManagerWidget']
+__all__ = ['FileSelector', 'GzipSchemeHandler', 'register_gzip_scheme', 'MapViewBridge', 'ScreenshotWriter', 'TrackListItem', 'TrackManagerWidget', 'shared_profile']
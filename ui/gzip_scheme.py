@@ -0,0 +1,53 @@
+"""
+gzhtml:// URL scheme serving gzip-compressed HTML pages to QtWebEngine
+Generated pages are stored compressed on disk and decompressed on request
+"""
+
+import gzip
+
+from PyQt5.QtCore import QBuffer, QByteArray, QUrl
+from PyQt5.QtWebEngineCore import (QWebEngineUrlRequestJob, QWebEngineUrlScheme,
+                                   QWebEngineUrlSchemeHandler)
+
+GZIP_SCHEME = b'gzhtml'
+GZIP_HOST = 'local'
+
+
+def register_gzip_scheme():
+    """Declare the gzhtml scheme; must be called before QApplication is created"""
+    scheme = QWebEngineUrlScheme(GZIP_SCHEME)
+    scheme.setSyntax(QWebEngineUrlScheme.Syntax.Host)
+    # Pages still load the qrc:// QWebChannel script and remote tiles/assets
+    scheme.setFlags(QWebEngineUrlScheme.SecureScheme | QWebEngineUrlScheme.LocalAccessAllowed)
+    QWebEngineUrlScheme.registerScheme(scheme)
+
+
+class GzipSchemeHandler(QWebEngineUrlSchemeHandler):
+    """Serves registered .html.gz files as gzhtml://local/<name>"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._files = {}
+
+    def add_file(self, name: str, file_path: str) -> QUrl:
+        """Make file_path available under name and return its gzhtml URL"""
+        self._files['/' + name] = file_path
+        return QUrl(f"{GZIP_SCHEME.decode()}://{GZIP_HOST}/{name}")
+
+    def requestStarted(self, job: QWebEngineUrlRequestJob):
+        file_path = self._files.get(job.requestUrl().path())
+        if file_path is None:
+            job.fail(QWebEngineUrlRequestJob.UrlNotFound)
+            return
+        try:
+            with gzip.open(file_path, 'rb') as f:
+                html = f.read()
+        except OSError:
+            job.fail(QWebEngineUrlRequestJob.RequestFailed)
+            return
+
+        # The buffer is parented to the job so it lives as long as the reply
+        buffer = QBuffer(job)
+        buffer.setData(QByteArray(html))
+        buffer.open(QBuffer.ReadOnly)
+        job.reply(b'text/html', buffer)
@@ -0,0 +1,33 @@
+"""
+QWebChannel bridge between the Leaflet map page and the Qt application
+Receives the map view (center/zoom) pushed by the page whenever it changes
+"""
+
+import json
+
+from PyQt5.QtCore import QObject, pyqtSignal, pyqtSlot
+
+
+class MapViewBridge(QObject):
+    """
+    Object exposed to the map page over QWebChannel
+
+    Signals:
+        view_changed: Emitted with {'current_center': [lat, lng], 'current_zoom': int}
+                      each time the user pans or zooms the map
+    """
+
+    view_changed = pyqtSignal(dict)
+
+    @pyqtSlot(str)
+    def on_view_changed(self, json_str: str):
+        """Called from JavaScript on Leaflet 'moveend'/'zoomend' events"""
+        try:
+            view_data = json.loads(json_str)
+            view_state = {
+                'current_center': [view_data['lat'], view_data['lng']],
+                'current_zoom': int(view_data['zoom'])
+            }
+        except (ValueError, KeyError, TypeError):
+            return
+        self.view_changed.emit(view_state)
@@ -0,0 +1,52 @@
+"""
+Background screenshot encoding
+Writes a captured QImage to disk on a QThreadPool worker so the GUI thread
+does not stall while PNG/JPEG data is compressed
+"""
+
+import os
+
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+from PyQt5.QtGui import QImage, QImageWriter
+
+
+class ScreenshotWriter(QObject):
+    """
+    Encodes screenshots off the GUI thread
+
+    Signals:
+        finished: Emitted with (file_path, success) once the image is written
+    """
+
+    finished = pyqtSignal(str, bool)
+
+    # Qt's PNG handler maps quality to zlib level as (100 - quality) * 9 / 91,
+    # so 80 gives level 1: much faster to encode for a slightly larger file
+    PNG_QUALITY = 80
+    JPEG_QUALITY = 85
+
+    def save(self, image: QImage, file_path: str):
+        """Write image to file_path in the background (format from the extension)"""
+        QThreadPool.globalInstance().start(_WriteTask(self, image, file_path))
+
+
+class _WriteTask(QRunnable):
+    """Runnable doing the actual encode + write for ScreenshotWriter"""
+
+    def __init__(self, writer: ScreenshotWriter, image: QImage, file_path: str):
+        super().__init__()
+        self.writer = writer
+        self.image = image
+        self.file_path = file_path
+
+    def run(self):
+        extension = os.path.splitext(self.file_path)[1].lower()
+        image_writer = QImageWriter(self.file_path)
+        if extension in ('.jpg', '.jpeg'):
+            image_writer.setFormat(b'jpeg')
+            image_writer.setQuality(ScreenshotWriter.JPEG_QUALITY)
+        elif extension in ('.png', ''):
+            image_writer.setFormat(b'png')
+            image_writer.setQuality(ScreenshotWriter.PNG_QUALITY)
+        # Signals emitted from the pool thread are queued to the GUI thread
+        self.writer.finished.emit(self.file_path, image_writer.write(self.image))
@@ -4,8 +4,9 @@ Displays track properties with inline editing
 """
 
 from PyQt5.QtWidgets import (QWidget, QHBoxLayout, QLabel, QLineEdit, 
-                             QSpinBox, QPushButton)
-from PyQt5.QtCore import pyqtSignal
+                             QSpinBox, QPushButton, QFrame)
+from PyQt5.QtCore import QTimer, pyqtSignal
+from PyQt5.QtGui import QColor, QPalette
 from models.track import Track
 
 
@@ -15,9 +16,19 @@ class TrackListItem(QWidget):
     properties_changed = pyqtSignal()
     remove_requested = pyqtSignal(object)
     
+    # Quiet time after the last keystroke before a renamed track is reported
+    NAME_EDIT_DELAY_MS = 300
+    
     def __init__(self, track: Track, parent=None):
         super().__init__(parent)
         self.track = track
+        
+        # Typing a name reports the change once, not once per character
+        self._name_timer = QTimer(self)
+        self._name_timer.setSingleShot(True)
+        self._name_timer.setInterval(self.NAME_EDIT_DELAY_MS)
+        self._name_timer.timeout.connect(self.properties_changed.emit)
+        
         self.setup_ui()
     
     def setup_ui(self):
@@ -26,12 +37,13 @@ class TrackListItem(QWidget):
         layout.setContentsMargins(5, 5, 5, 5)
         
         # Color display (non-clickable)
+        # Filled from its palette, recoloring without going through a style sheet
         self.color_label = QLabel()
         self.color_label.setFixedSize(30, 30)
-        self.color_label.setStyleSheet(
-            f"background-color: {self.track.color or '#FF0000'}; "
-            f"border: 2px solid #666; border-radius: 3px;"
-        )
+        self.color_label.setAutoFillBackground(True)
+        self.color_label.setFrameStyle(QFrame.Box | QFrame.Plain)
+        self.color_label.setLineWidth(2)
+        self.update_color_display()
         layout.addWidget(self.color_label)
         
         # Name input
@@ -62,18 +74,22 @@ class TrackListItem(QWidget):
         self.setLayout(layout)
     
     def update_name(self, name: str):
-        """Update track name"""
+        """Update track name, reporting it once typing pauses"""
         self.track.name = name
-        self.properties_changed.emit()
+        self._name_timer.start()
     
     def update_width(self):
         """Update line width"""
-        self.track.line_width = self.width_spinner.value()
+        # editingFinished also fires when the spinner merely loses focus
+        width = self.width_spinner.value()
+        if width == getattr(self.track, 'line_width', 5):
+            return
+        self.track.line_width = width
         self.properties_changed.emit()
     
     def update_color_display(self):
         """Update the color display label"""
-        self.color_label.setStyleSheet(
-            f"background-color: {self.track.color or '#FF0000'}; "
-            f"border: 2px solid #666; border-radius: 3px;"
-        )
+        palette = self.color_label.palette()
+        palette.setColor(QPalette.Window, QColor(self.track.color or '#FF0000'))
+        palette.setColor(QPalette.WindowText, QColor('#666'))
+        self.color_label.setPalette(palette)
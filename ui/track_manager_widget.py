@@ -7,15 +7,14 @@ from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QPushButton,
                              QListWidget, QListWidgetItem, QDockWidget,
                              QMessageBox, QApplication)
 from PyQt5.QtCore import Qt, pyqtSignal
-from typing import List, Optional
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import List, Optional, Tuple
 import os
 
 from models.track import Track
 from ui.track_list_item import TrackListItem
 from ui.file_selector import FileSelector
-from parsers.gpx_parser import GPXParser
-from parsers.igc_parser import IGCParser
-from parsers.tcx_parser import TCXParser
+from parsers import parse_track_file
 
 
 class TrackManagerWidget(QDockWidget):
@@ -32,6 +31,9 @@ class TrackManagerWidget(QDockWidget):
     track_properties_changed = pyqtSignal()
     map_screenshot_requested = pyqtSignal()
     
+    # Emitted from the parsing thread each time a file has been parsed
+    _file_parsed = pyqtSignal()
+    
     # Color palette for tracks (can be overridden by applications)
     COLORS = [
         '#457B9D', '#2A9D8F', '#F4A261', '#E76F51', '#264653',
@@ -43,6 +45,12 @@ class TrackManagerWidget(QDockWidget):
     def __init__(self, title: str = "Active Tracklogs", parent=None):
         super().__init__(title, parent)
         self.tracks: List[Track] = []
+        # Files being loaded with their parse results, and how many are reported
+        self._loading: List[Tuple[str, Future]] = []
+        self._loaded_count = 0
+        # Queued even when emitted from this thread, so results are always
+        # handled by the event loop rather than in the middle of add_tracks
+        self._file_parsed.connect(self._on_file_parsed, Qt.QueuedConnection)
         self.setup_ui()
         
     def setup_ui(self):
@@ -71,10 +79,10 @@ class TrackManagerWidget(QDockWidget):
         # Control buttons
         button_layout = QHBoxLayout()
         
-        add_btn = QPushButton("Add Tracks")
-        add_btn.setStyleSheet("padding: 8px; font-size: 12px;")
-        add_btn.clicked.connect(self.add_tracks)
-        button_layout.addWidget(add_btn)
+        self.add_btn = QPushButton("Add Tracks")
+        self.add_btn.setStyleSheet("padding: 8px; font-size: 12px;")
+        self.add_btn.clicked.connect(self.add_tracks)
+        button_layout.addWidget(self.add_btn)
         
         clear_btn = QPushButton("Clear All")
         clear_btn.setStyleSheet("padding: 8px; font-size: 12px;")
@@ -108,47 +116,63 @@ class TrackManagerWidget(QDockWidget):
             self.parent().statusBar().showMessage(f"Loading {len(file_paths)} track(s)...")
             QApplication.processEvents()
         
-        gpx_parser = GPXParser()
-        igc_parser = IGCParser()
-        tcx_parser = TCXParser()
-        added_count = 0
+        # Files are parsed one after the other on a background thread. Worker
+        # processes do not pay off: sending a parsed Track back (pickling its
+        # points and timestamps) costs more than parsing the file.
+        executor = ThreadPoolExecutor(max_workers=1)
+        self._loading = [(file_path, executor.submit(parse_track_file, file_path))
+                         for file_path in file_paths]
+        self._loaded_count = 0
+        # The thread ends once the submitted files are parsed
+        executor.shutdown(wait=False)
         
-        for i, file_path in enumerate(file_paths):
-            # Update progress message
+        # Another load would mix its tracks into this one
+        self.add_btn.setEnabled(False)
+        for _, future in self._loading:
+            future.add_done_callback(lambda _: self._file_parsed.emit())
+    
+    def _on_file_parsed(self):
+        """Report the files parsed so far, in order, and add the tracks once all are"""
+        total = len(self._loading)
+        while self._loaded_count < total and self._loading[self._loaded_count][1].done():
+            file_path = self._loading[self._loaded_count][0]
+            self._loaded_count += 1
             if self.parent():
                 self.parent().statusBar().showMessage(
-                    f"Loading track {i+1}/{len(file_paths)}: {os.path.basename(file_path)}"
+                    f"Loaded track {self._loaded_count}/{total}: {os.path.basename(file_path)}"
                 )
-                QApplication.processEvents()
-            
+        if total and self._loaded_count == total:
+            self._add_loaded_tracks()
+    
+    def _add_loaded_tracks(self):
+        """Add the tracks of the finished load to the list"""
+        loaded, self._loading = self._loading, []
+        self.add_btn.setEnabled(True)
+        added_count = 0
+        
+        # Tracks are added in selection order, which their colors follow
+        for file_path, future in loaded:
             try:
-                if file_path.lower().endswith('.gpx'):
-                    track = gpx_parser.parse(file_path)
-                elif file_path.lower().endswith('.igc'):
-                    track = igc_parser.parse(file_path)
-                elif file_path.lower().endswith('.tcx'):
-                    track = tcx_parser.parse(file_path)
-                else:
-                    continue
-                
-                if track:
-                    # Assign fixed color from palette
-                    track.color = self.COLORS[len(self.tracks) % len(self.COLORS)]
-                    
-                    # Set default line width
-                    if not hasattr(track, 'line_width'):
-                        track.line_width = 5
-                    
-                    self.tracks.append(track)
-                    self.add_track_to_list(track)
-                    added_count += 1
-                    
+                track = future.result()
             except Exception as e:
                 QMessageBox.warning(
                     self, 
                     "Error", 
                     f"Error loading {file_path}:\n{str(e)}"
                 )
+                continue
+            
+            if track:
+                # Assign fixed color from palette
+                track.color = self.COLORS[len(self.tracks) % len(self.COLORS)]
+                
+                # Set default line width
+                if not hasattr(track, 'line_width'):
+                    track.line_width = 5
+                
+                self.tracks.append(track)
+                self.add_track_to_list(track)
+                added_count += 1
         
         if added_count > 0:
             if self.parent():
@@ -0,0 +1,27 @@
+"""
+Shared QtWebEngine profile for the application's web views
+Keeps a persistent on-disk HTTP cache so that map tiles are reused across
+page reloads, base map switches and application runs
+"""
+
+from typing import Optional
+
+from PyQt5.QtWidgets import QApplication
+from PyQt5.QtWebEngineWidgets import QWebEngineProfile
+
+PROFILE_NAME = "gpstrackdisplay"
+HTTP_CACHE_SIZE = 256 * 1024 * 1024  # bytes
+
+_shared_profile: Optional[QWebEngineProfile] = None
+
+
+def shared_profile() -> QWebEngineProfile:
+    """Return the profile shared by all web views, creating it on first use"""
+    global _shared_profile
+    if _shared_profile is None:
+        # Parented to the application; windows delete their pages when closed,
+        # as QtWebEngine requires a page to be deleted before its profile
+        _shared_profile = QWebEngineProfile(PROFILE_NAME, QApplication.instance())
+        _shared_profile.setHttpCacheType(QWebEngineProfile.DiskHttpCache)
+        _shared_profile.setHttpCacheMaximumSize(HTTP_CACHE_SIZE)
+    return _shared_profile
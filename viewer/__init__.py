@@ -1,7 +1,27 @@
 """Viewer package"""
 
-from .base_viewer import BaseViewer
-from .curve_viewer import CurveViewer
-from .map_viewer import MapViewer
+import importlib
+
+# Module defining each viewer, only imported when the viewer is first used so
+# that importing one viewer does not load the libraries of all of them
+_VIEWER_MODULES = {
+    'BaseViewer': '.base_viewer',
+    'CurveViewer': '.curve_viewer',
+    'MapViewer': '.map_viewer',
+}
+
+
+def __getattr__(name: str):
+    module_name = _VIEWER_MODULES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_VIEWER_MODULES))
+
 
 __all__ = ['BaseViewer', 'CurveViewer', 'MapViewer']
@@ -4,7 +4,7 @@ Defines common interface that all viewers must implement
 """
 
 from abc import ABC, abstractmethod
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Any, Mapping
 from models.track import Track
 
 
@@ -28,23 +28,26 @@ class BaseViewer(ABC):
         pass
     
     @abstractmethod
-    def get_available_options(self) -> Dict[str, Any]:
+    def get_available_options(self) -> Mapping[str, Any]:
         """
         Get available configuration options for this viewer type
         
         Returns:
-            Dictionary of option names to their configurations
+            Mapping of option names to their configurations, shared by all
+            callers: it is read-only, the nested configurations must not be
+            modified either
             Example: {'base_layer': {'type': 'combo', 'values': ['Topo', 'Satellite']}}
         """
         pass
     
     @abstractmethod
-    def get_default_options(self) -> Dict[str, Any]:
+    def get_default_options(self) -> Mapping[str, Any]:
         """
         Get default values for all options
         
         Returns:
-            Dictionary of option names to default values
+            Read-only mapping of option names to default values, shared by all
+            callers (copy it to update it)
         """
         pass
     
@@ -4,23 +4,28 @@ Example of reusing the base architecture for a different visualization
 """
 
 import os
-from typing import List, Dict, Any, Optional
+from collections import OrderedDict
+from types import MappingProxyType
+from typing import List, Dict, Any, Mapping, Optional
+import numpy as np
 import matplotlib
 matplotlib.use('Qt5Agg')
 import matplotlib.pyplot as plt
-from matplotlib.figure import Figure
-from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
-from matplotlib.backends.backend_qt5agg import NavigationToolbar2QT as NavigationToolbar
 from models.track import Track
 from viewer.base_viewer import BaseViewer
+from viewer.figure_canvas import FigureCanvasMixin
+from viewer.downsampling import lttb_indices
+from viewer.smoothing import moving_average
 
 
-class CurveViewer(BaseViewer):
+class CurveViewer(FigureCanvasMixin, BaseViewer):
     """
     Create and display interactive matplotlib charts with GPS track data
     Shows altitude, speed, power, heart rate, etc. over time/distance
     """
     
+    FIGSIZE = (10, 6)
+    
     # Available data attributes
     AVAILABLE_DATA = [
         'Distance (km)',
@@ -38,6 +43,16 @@ class CurveViewer(BaseViewer):
     # Sequential data types (for line plots)
     SEQUENTIAL_DATA = ['Distance (km)', 'Time (min)', 'Point Index']
     
+    # Moving average window (points) used when smoothing is enabled
+    SMOOTHING_WINDOW = 15
+    
+    # Data series kept between renders, least recently used dropped first
+    DATA_CACHE_SIZE = 64
+    
+    # Points drawn per line plot, longer tracks being downsampled (more than
+    # the figure is wide in pixels, so the line looks the same)
+    MAX_LINE_POINTS = 3000
+    
     # Available colormaps
     AVAILABLE_COLORMAPS = [
         'viridis',
@@ -56,53 +71,63 @@ class CurveViewer(BaseViewer):
         'winter'
     ]
     
+    _AVAILABLE_OPTIONS = MappingProxyType({
+        'x_data': {
+            'type': 'combo',
+            'values': AVAILABLE_DATA,
+            'label': 'X-Axis Data'
+        },
+        'y_data': {
+            'type': 'combo',
+            'values': AVAILABLE_DATA,
+            'label': 'Y-Axis Data'
+        },
+        'color_data': {
+            'type': 'combo',
+            'values': ['None'] + AVAILABLE_DATA,
+            'label': 'Color Data'
+        },
+        'colormap': {
+            'type': 'combo',
+            'values': AVAILABLE_COLORMAPS,
+            'label': 'Colormap'
+        },
+        'show_legend': {
+            'type': 'checkbox',
+            'default': True,
+            'label': 'Show Legend'
+        },
+        'smooth_data': {
+            'type': 'checkbox',
+            'default': False,
+            'label': 'Smooth Data'
+        }
+    })
+    
+    _DEFAULT_OPTIONS = MappingProxyType({
+        'x_data': 'Distance (km)',
+        'y_data': 'Altitude (m)',
+        'color_data': 'None',
+        'colormap': 'viridis',
+        'color_min': None,
+        'color_max': None,
+        'show_legend': True,
+        'smooth_data': False
+    })
+    
     def __init__(self):
         super().__init__()
-        self.figure = None
-        self.canvas = None
-        self.toolbar = None
+        self.ax = None  # Data axes of the current track plot
+        # (id(track), data type) -> (track, values), in least recently used order
+        self._data_cache: OrderedDict = OrderedDict()
     
-    def get_available_options(self) -> Dict[str, Any]:
+    def get_available_options(self) -> Mapping[str, Any]:
         """Get available configuration options for curve viewer"""
-        return {
-            'x_data': {
-                'type': 'combo',
-                'values': self.AVAILABLE_DATA,
-                'label': 'X-Axis Data'
-            },
-            'y_data': {
-                'type': 'combo',
-                'values': self.AVAILABLE_DATA,
-                'label': 'Y-Axis Data'
-            },
-            'color_data': {
-                'type': 'combo',
-                'values': ['None'] + self.AVAILABLE_DATA,
-                'label': 'Color Data'
-            },
-            'colormap': {
-                'type': 'combo',
-                'values': self.AVAILABLE_COLORMAPS,
-                'label': 'Colormap'
-            },
-            'show_legend': {
-                'type': 'checkbox',
-                'default': True,
-                'label': 'Show Legend'
-            }
-        }
+        return self._AVAILABLE_OPTIONS
     
-    def get_default_options(self) -> Dict[str, Any]:
+    def get_default_options(self) -> Mapping[str, Any]:
         """Get default options for curve viewer"""
-        return {
-            'x_data': 'Distance (km)',
-            'y_data': 'Altitude (m)',
-            'color_data': 'None',
-            'colormap': 'viridis',
-            'color_min': None,
-            'color_max': None,
-            'show_legend': True
-        }
+        return self._DEFAULT_OPTIONS
     
     def create_view(self, tracks: List[Track], options: Dict[str, Any] = None) -> tuple:
         """
@@ -113,7 +138,7 @@ class CurveViewer(BaseViewer):
             return self._create_empty_view()
         
         # Get options
-        opts = self.get_default_options()
+        opts = dict(self.get_default_options())
         if options:
             opts.update(options)
         
@@ -124,14 +149,13 @@ class CurveViewer(BaseViewer):
         color_min = opts.get('color_min', None)
         color_max = opts.get('color_max', None)
         show_legend = opts.get('show_legend', True)
+        smooth_data = opts.get('smooth_data', False)
         
-        # Create figure and canvas
-        self.figure = Figure(figsize=(10, 6), dpi=100)
-        self.canvas = FigureCanvas(self.figure)
-        self.toolbar = NavigationToolbar(self.canvas, None)
+        self._reset_figure()
         
         # Create the plot
         ax = self.figure.add_subplot(111)
+        self.ax = ax
         
         # Determine plot type based on X-axis data
         use_line_plot = x_data in self.SEQUENTIAL_DATA
@@ -141,10 +165,10 @@ class CurveViewer(BaseViewer):
         
         for idx, track in enumerate(tracks):
             # Get data values
-            x_values = self._get_data_values(track, x_data)
-            y_values = self._get_data_values(track, y_data)
+            x_values = self._get_cached_data_values(track, x_data)
+            y_values = self._get_cached_data_values(track, y_data)
             
-            if not x_values or not y_values:
+            if len(x_values) == 0 or len(y_values) == 0:
                 continue
             
             # Ensure both have same length
@@ -152,12 +176,16 @@ class CurveViewer(BaseViewer):
             x_values = x_values[:min_len]
             y_values = y_values[:min_len]
             
+            # Smooth measured data (sequential axes are left as they are)
+            if smooth_data and y_data not in self.SEQUENTIAL_DATA:
+                y_values = moving_average(y_values, self.SMOOTHING_WINDOW)
+            
             label = track.name if track.name else f"Track {idx + 1}"
             
             # Handle color data
             if color_data != 'None':
-                color_values = self._get_data_values(track, color_data)
-                if color_values:
+                color_values = self._get_cached_data_values(track, color_data)
+                if len(color_values) > 0:
                     color_values = color_values[:min_len]
                     # Create scatter plot with color mapping
                     scatter = ax.scatter(x_values, y_values, c=color_values, 
@@ -170,13 +198,15 @@ class CurveViewer(BaseViewer):
                 else:
                     # Fallback to standard plot if color data not available
                     if use_line_plot:
-                        ax.plot(x_values, y_values, label=label, color=colors[idx], linewidth=2)
+                        ax.plot(*self._downsample_line(x_values, y_values), label=label,
+                                color=colors[idx], linewidth=2)
                     else:
                         ax.scatter(x_values, y_values, label=label, color=colors[idx], s=50)
             else:
                 # Standard plot without color mapping
                 if use_line_plot:
-                    ax.plot(x_values, y_values, label=label, color=colors[idx], linewidth=2)
+                    ax.plot(*self._downsample_line(x_values, y_values), label=label,
+                            color=colors[idx], linewidth=2)
                 else:
                     ax.scatter(x_values, y_values, label=label, color=colors[idx], s=50)
         
@@ -191,13 +221,31 @@ class CurveViewer(BaseViewer):
         
         self.figure.tight_layout()
         
+        self.canvas.draw_idle()
         return self.canvas, self.toolbar
     
+    def set_legend_visible(self, visible: bool) -> bool:
+        """
+        Show or hide the legend of the current track plot without rebuilding it
+        
+        Returns:
+            False if there is no track plot to update (create_view is needed)
+        """
+        if self.ax is None:
+            return False
+        
+        legend = self.ax.get_legend()
+        if legend is None and visible:
+            self.ax.legend(loc='best', framealpha=0.9)
+        elif legend is not None:
+            legend.set_visible(visible)
+        self.canvas.draw_idle()
+        return True
+    
     def _create_empty_view(self) -> tuple:
         """Create an empty view when no tracks are loaded"""
-        self.figure = Figure(figsize=(10, 6), dpi=100)
-        self.canvas = FigureCanvas(self.figure)
-        self.toolbar = NavigationToolbar(self.canvas, None)
+        self._reset_figure()
+        self.ax = None
         
         ax = self.figure.add_subplot(111)
         ax.text(0.5, 0.5, 'No Tracks Loaded\n\nUse "Add Tracks" to load GPS track files',
@@ -210,96 +258,97 @@ class CurveViewer(BaseViewer):
         ax.spines['bottom'].set_visible(False)
         ax.spines['left'].set_visible(False)
         
+        self.canvas.draw_idle()
         return self.canvas, self.toolbar
     
-    def _get_data_values(self, track: Track, data_type: str) -> List:
+    def _downsample_line(self, x_values, y_values) -> tuple:
+        """Reduce a line plot to MAX_LINE_POINTS points with LTTB"""
+        if len(x_values) <= self.MAX_LINE_POINTS:
+            return x_values, y_values
+        keep = lttb_indices(x_values, y_values, self.MAX_LINE_POINTS)
+        return np.asarray(x_values)[keep], np.asarray(y_values)[keep]
+    
+    def invalidate(self, track: Optional[Track] = None):
+        """Drop the cached data series of a track (of all tracks if None)"""
+        if track is None:
+            self._data_cache.clear()
+            return
+        for key in [key for key, (cached, _) in self._data_cache.items() if cached is track]:
+            del self._data_cache[key]
+    
+    def _get_cached_data_values(self, track: Track, data_type: str):
+        """_get_data_values() memoized in the LRU data cache"""
+        key = (id(track), data_type)
+        entry = self._data_cache.get(key)
+        # The track is kept in the entry so that a reused id() is not mistaken for it
+        if entry is not None and entry[0] is track:
+            self._data_cache.move_to_end(key)
+            return entry[1]
+        
+        values = self._get_data_values(track, data_type)
+        self._data_cache[key] = (track, values)
+        self._data_cache.move_to_end(key)
+        while len(self._data_cache) > self.DATA_CACHE_SIZE:
+            self._data_cache.popitem(last=False)
+        return values
+    
+    def _get_data_values(self, track: Track, data_type: str):
         """Get data values based on data type selection"""
         if data_type == 'Distance (km)':
-            # Calculate cumulative distance
-            from math import radians, cos, sin, asin, sqrt
-            distances = [0.0]
-            for i in range(1, len(track.points)):
-                p1 = track.points[i - 1]
-                p2 = track.points[i]
-                
-                lon1, lat1, lon2, lat2 = map(radians, [p1.longitude, p1.latitude, 
-                                                         p2.longitude, p2.latitude])
-                dlon = lon2 - lon1
-                dlat = lat2 - lat1
-                a = sin(dlat/2)**2 + cos(lat1) * cos(lat2) * sin(dlon/2)**2
-                c = 2 * asin(sqrt(a))
-                r = 6371  # Earth radius in km
-                distances.append(distances[-1] + c * r)
-            return distances
+            return track.cumulative_distances()
             
         elif data_type == 'Time (min)':
             if not track.points[0].timestamp:
                 return []
-            start_time = track.points[0].timestamp
-            return [(p.timestamp - start_time).total_seconds() / 60 for p in track.points if p.timestamp]
+            elapsed = track.elapsed_time
+            return elapsed[~np.isnan(elapsed)] / 60
             
         elif data_type == 'Point Index':
-            return list(range(len(track.points)))
+            return np.arange(len(track.points))
             
         elif data_type == 'Altitude (m)':
-            return [p.altitude if p.altitude is not None else 0 for p in track.points]
+            return self._attribute_values(track, 'altitude')
             
         elif data_type == 'Speed (km/h)':
-            speeds = []
-            for i in range(1, len(track.points)):
-                p1 = track.points[i - 1]
-                p2 = track.points[i]
-                if p1.timestamp and p2.timestamp:
-                    from math import radians, cos, sin, asin, sqrt
-                    lon1, lat1, lon2, lat2 = map(radians, [p1.longitude, p1.latitude,
-                                                             p2.longitude, p2.latitude])
-                    dlon = lon2 - lon1
-                    dlat = lat2 - lat1
-                    a = sin(dlat/2)**2 + cos(lat1) * cos(lat2) * sin(dlon/2)**2
-                    c = 2 * asin(sqrt(a))
-                    distance = 6371 * c  # km
-                    time_diff = (p2.timestamp - p1.timestamp).total_seconds() / 3600  # hours
-                    if time_diff > 0:
-                        speeds.append(distance / time_diff)
-                    else:
-                        speeds.append(0)
+            # Segments with both timestamps known, 0 km/h if time does not advance
+            hours = track.time_deltas() / 3600
+            timed = ~np.isnan(hours)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                speeds = np.where(hours > 0, track.segment_distances() / hours, 0.0)[timed]
             # Add first point with same speed as second
-            if speeds:
-                speeds.insert(0, speeds[0])
+            if len(speeds):
+                speeds = np.concatenate((speeds[:1], speeds))
             return speeds
             
         elif data_type == 'Heart Rate (bpm)':
-            return [p.heart_rate if p.heart_rate is not None else 0 for p in track.points]
+            return self._attribute_values(track, 'heart_rate')
             
         elif data_type == 'Power (W)':
-            return [p.power if p.power is not None else 0 for p in track.points]
+            return self._attribute_values(track, 'power')
             
         elif data_type == 'Cadence (rpm)':
-            return [p.cadence if p.cadence is not None else 0 for p in track.points]
+            return self._attribute_values(track, 'cadence')
             
         elif data_type == 'Temperature (°C)':
-            return [p.temperature if p.temperature is not None else 0 for p in track.points]
+            return self._attribute_values(track, 'temperature')
             
         elif data_type == 'Vertical Speed (m/s)':
-            vert_speeds = []
-            for i in range(1, len(track.points)):
-                p1 = track.points[i - 1]
-                p2 = track.points[i]
-                if p1.altitude is not None and p2.altitude is not None and p1.timestamp and p2.timestamp:
-                    alt_diff = p2.altitude - p1.altitude
-                    time_diff = (p2.timestamp - p1.timestamp).total_seconds()
-                    if time_diff > 0:
-                        vert_speeds.append(alt_diff / time_diff)
-                    else:
-                        vert_speeds.append(0)
-                else:
-                    vert_speeds.append(0)
+            # 0 m/s where an altitude or timestamp is missing or time does not advance
+            time_diffs = track.time_deltas()
+            with np.errstate(divide='ignore', invalid='ignore'):
+                vert_speeds = np.where(time_diffs > 0, np.diff(track.elev) / time_diffs, 0.0)
             # Add first point with zero vertical speed
-            vert_speeds.insert(0, 0)
-            return vert_speeds
+            return np.concatenate(([0.0], np.nan_to_num(vert_speeds)))
         
         return []
     
+    def _attribute_values(self, track: Track, attribute: str) -> np.ndarray:
+        """Values of a point attribute, 0 where missing"""
+        if attribute not in track.available_attributes:
+            # No column is built for an attribute the track does not have
+            return np.zeros(len(track.points))
+        return np.nan_to_num(track.column(attribute))
+    
     def save_view(self, tracks: List[Track], output_file: str, options: Dict[str, Any] = None):
         """Save the matplotlib figure to a file"""
         if self.figure is None:
@@ -0,0 +1,54 @@
+"""
+Downsampling helpers for curve data
+Largest-Triangle-Three-Buckets keeps the visual shape of a long line plot
+"""
+
+import numpy as np
+
+
+def lttb_indices(x, y, threshold: int) -> np.ndarray:
+    """
+    Indices of the points kept by Largest-Triangle-Three-Buckets downsampling
+
+    The points between the first and last are split into threshold - 2
+    buckets; each bucket keeps the point forming the largest triangle with the
+    point kept in the previous bucket and the average of the next bucket.
+
+    Args:
+        x: Point x values, in increasing order
+        y: Point y values (no missing values)
+        threshold: Number of points to keep
+
+    Returns:
+        Sorted indices of the kept points (always including the first and last)
+    """
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+
+    # Bucket i covers the points edges[i] to edges[i + 1] (excluded)
+    edges = (np.arange(threshold - 1) * ((n - 2) / (threshold - 2))).astype(np.intp) + 1
+    edges[-1] = n - 1
+    counts = np.diff(edges)
+    mean_x = np.add.reduceat(x[1:n - 1], edges[:-1] - 1) / counts
+    mean_y = np.add.reduceat(y[1:n - 1], edges[:-1] - 1) / counts
+    # The bucket after the last one is the last point
+    mean_x = np.append(mean_x[1:], x[n - 1])
+    mean_y = np.append(mean_y[1:], y[n - 1])
+
+    keep = np.empty(threshold, dtype=np.intp)
+    keep[0] = 0
+    keep[-1] = n - 1
+    a = 0
+    for i in range(threshold - 2):
+        start, end = edges[i], edges[i + 1]
+        # Twice the triangle areas, the constant factor not changing the argmax
+        areas = np.abs((x[a] - mean_x[i]) * (y[start:end] - y[a])
+                       - (x[a] - x[start:end]) * (mean_y[i] - y[a]))
+        a = start + int(np.argmax(areas))
+        keep[i + 1] = a
+
+    return keep
@@ -0,0 +1,35 @@
+"""
+Reused matplotlib figure and canvas for the chart viewers
+"""
+
+from typing import Tuple
+import matplotlib
+matplotlib.use('Qt5Agg')
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
+from matplotlib.backends.backend_qt5agg import NavigationToolbar2QT as NavigationToolbar
+
+
+class FigureCanvasMixin:
+    """Figure, canvas and toolbar created once and redrawn for every plot"""
+
+    # Figure size in inches, set by each viewer
+    FIGSIZE: Tuple[float, float] = (10, 6)
+
+    def __init__(self):
+        super().__init__()
+        self.figure = None
+        self.canvas = None
+        self.toolbar = None
+
+    def _reset_figure(self):
+        """Clear the figure for a new plot, creating it and its canvas on first use"""
+        if self.figure is None:
+            self.figure = Figure(figsize=self.FIGSIZE, dpi=100)
+            self.canvas = FigureCanvas(self.figure)
+            self.toolbar = NavigationToolbar(self.canvas, None)
+        else:
+            # Plots are redrawn in the same canvas, the widgets stay in place
+            self.figure.clear()
+            # Forget the zoom/pan history of the previous plot
+            self.toolbar.update()
@@ -2,14 +2,214 @@
 Map viewer using Folium - Refactored to inherit from BaseViewer
 """
 
+import base64
 import folium
+import gzip
+import json
+import numpy as np
 import os
+import string
 import webbrowser
-from typing import List, Optional, Dict, Any
+from pathlib import Path
+from types import MappingProxyType
+from typing import List, Optional, Dict, Any, Mapping
+from branca.element import Element, MacroElement
+from folium.elements import JSCSSMixin
+from jinja2 import Template
 from models.track import Track
 from viewer.base_viewer import BaseViewer
 
 
+# Legend markup, filled with string.Template so that the CSS braces need no escaping
+_LEGEND_HEADER_HTML = '''
+            <div style="position: fixed; 
+                        top: 10px; right: 10px; 
+                        width: 250px; 
+                        background-color: white; 
+                        border:2px solid grey; 
+                        z-index:9999; 
+                        font-size:14px;
+                        padding: 10px;
+                        border-radius: 5px;
+                        box-shadow: 2px 2px 5px rgba(0,0,0,0.3);">
+                <h4 style="margin-top:0;">GPS Tracks</h4>
+            '''
+
+_LEGEND_ENTRY_TEMPLATE = string.Template('''
+                <p style="margin: 5px 0;">
+                    <span style="background-color:$color; 
+                                width: 20px; 
+                                height: 3px; 
+                                display: inline-block; 
+                                margin-right: 5px;"></span>
+                    $name ($track_type)
+                </p>
+                ''')
+
+_COLOR_SCALE_LEGEND_TEMPLATE = string.Template('''
+            <div style="position: fixed; 
+                        top: 10px; right: 10px; 
+                        width: 200px; 
+                        background-color: white; 
+                        border:2px solid grey; 
+                        z-index:9999; 
+                        font-size:14px;
+                        padding: 10px;
+                        border-radius: 5px;
+                        box-shadow: 2px 2px 5px rgba(0,0,0,0.3);">
+                <h4 style="margin-top:0; margin-bottom:10px;">$title</h4>
+                <div style="display: flex; align-items: stretch;">
+                    <div style="background: $gradient; 
+                                height: 150px; 
+                                width: 30px;"></div>
+                    <div style="display: flex; 
+                                flex-direction: column; 
+                                justify-content: space-between; 
+                                margin-left: 10px; 
+                                height: 150px;">
+                        <div style="margin-top: 0;">$max_label</div>
+                        <div>$mid_label</div>
+                        <div style="margin-bottom: 0;">$min_label</div>
+                    </div>
+                </div>
+            </div>
+            ''')
+
+
+class ViewBridge(JSCSSMixin, MacroElement):
+    """
+    Pushes the Leaflet view (center/zoom) to the host application over QWebChannel
+    on every 'moveend'/'zoomend', so the host never has to query the page
+    """
+    
+    _template = Template("""
+        {% macro script(this, kwargs) %}
+        if (typeof QWebChannel !== 'undefined' && typeof qt !== 'undefined') {
+            new QWebChannel(qt.webChannelTransport, function(channel) {
+                var bridge = channel.objects.{{ this.bridge_name }};
+                var map = {{ this._parent.get_name() }};
+                function pushView() {
+                    var center = map.getCenter();
+                    bridge.on_view_changed(JSON.stringify({
+                        lat: center.lat,
+                        lng: center.lng,
+                        zoom: map.getZoom()
+                    }));
+                }
+                map.on('moveend zoomend', pushView);
+                pushView();
+            });
+        }
+        {% endmacro %}
+    """)
+    
+    default_js = [
+        ('qwebchannel', 'qrc:///qtwebchannel/qwebchannel.js')
+    ]
+    
+    def __init__(self, bridge_name: str):
+        super().__init__()
+        self._name = 'ViewBridge'
+        self.bridge_name = bridge_name
+
+
+class RenderedElement(Element):
+    """
+    Element holding already rendered text
+
+    branca wraps rendered macros in Element(text), which compiles the text as
+    a Jinja template: slow for large embedded data and broken by '{{' or '{%'
+    in it (e.g. in a track name). This element outputs its text verbatim.
+    """
+
+    def __init__(self, text: str):
+        super().__init__()
+        self.text = text
+
+    def render(self, **kwargs) -> str:
+        return self.text
+
+
+class TrackLayer(MacroElement):
+    """
+    Feature group holding all tracks, markers and the legend, drawn client-side
+    from JSON data by renderTrackLayer()
+    
+    The group is exposed as window.trackLayer so that the host application can
+    redraw it in place (see MapViewer.create_track_layer_script) instead of
+    reloading the whole page.
+    """
+    
+    _template = Template("""
+        {% macro script(this, kwargs) %}
+        function renderTrackLayer(layer, data) {
+            layer.clearLayers();
+            data.tracks.forEach(function(track) {
+                var latlngs = track.latlngs;
+                if (track.codes !== undefined) {
+                    // Segment color codes: base64 uint8 indices into data.palette,
+                    // NO_VALUE for segments without data
+                    var raw = atob(track.codes);
+                    var codes = new Uint8Array(raw.length);
+                    for (var k = 0; k < raw.length; k++) {
+                        codes[k] = raw.charCodeAt(k);
+                    }
+                    // One polyline per run of equally colored segments
+                    var start = 0;
+                    for (var i = 1; i <= codes.length; i++) {
+                        if (i < codes.length && codes[i] === codes[start]) {
+                            continue;
+                        }
+                        if (codes[start] !== data.no_value) {
+                            L.polyline(latlngs.slice(start, i + 1), {
+                                color: data.palette[codes[start]], weight: 3, opacity: 0.8
+                            }).addTo(layer);
+                        }
+                        start = i;
+                    }
+                } else {
+                    L.polyline(latlngs, {
+                        color: track.color, weight: track.weight, opacity: 0.7
+                    }).bindPopup(track.popup).addTo(layer);
+                }
+                if (data.show_start_stop && latlngs.length > 0) {
+                    L.marker(latlngs[0], {
+                        icon: L.AwesomeMarkers.icon({
+                            icon: 'play', markerColor: 'green', iconColor: 'white', prefix: 'glyphicon'
+                        })
+                    }).bindPopup('Start: ' + track.name).addTo(layer);
+                    L.marker(latlngs[latlngs.length - 1], {
+                        icon: L.AwesomeMarkers.icon({
+                            icon: 'stop', markerColor: 'red', iconColor: 'white', prefix: 'glyphicon'
+                        })
+                    }).bindPopup('End: ' + track.name).addTo(layer);
+                }
+            });
+            var legend = document.getElementById('track-legend');
+            if (!legend) {
+                legend = document.createElement('div');
+                legend.id = 'track-legend';
+                document.body.appendChild(legend);
+            }
+            legend.innerHTML = data.legend_html;
+        }
+        var {{ this.get_name() }} = L.featureGroup().addTo({{ this._parent.get_name() }});
+        window.trackLayer = {{ this.get_name() }};
+        renderTrackLayer(window.trackLayer, {{ this.data_json }});
+        {% endmacro %}
+    """)
+    
+    def __init__(self, data_json: str):
+        super().__init__()
+        self._name = 'TrackLayer'
+        self.data_json = data_json
+    
+    def render(self, **kwargs):
+        """Add the script (with its embedded data) to the figure without recompiling it"""
+        script = self._template.module.__dict__['script']
+        self.get_root().script.add_child(RenderedElement(script(self, kwargs)), name=self.get_name())
+
+
 class MapViewer(BaseViewer):
     """Create and display interactive maps with GPS tracks"""
     
@@ -34,6 +234,33 @@ class MapViewer(BaseViewer):
         'Temperature (°C)'
     ]
     
+    # TrackPoint attribute behind each color mode
+    COLOR_MODE_ATTRIBUTES = {
+        'Altitude (m)': 'altitude',
+        'Vertical Speed (m/s)': 'vertical_speed_ms',
+        'Vertical Speed (m/h)': 'vertical_speed_mh',
+        'Power (W)': 'power',
+        'Heart Rate (bpm)': 'heart_rate',
+        'Cadence (rpm)': 'cadence',
+        'Temperature (°C)': 'temperature',
+        'Speed (km/h)': 'speed'
+    }
+    
+    # Number of colors segment values are quantized to on colored tracks;
+    # code COLOR_LEVELS (255) marks segments without a value
+    COLOR_LEVELS = 255
+    
+    # Line simplification tolerance for single color tracks, in degrees
+    # (about 1 m, below what can be seen at the highest zoom level)
+    SIMPLIFY_EPSILON = 1e-5
+    
+    # Decimal places of the coordinates sent to the page (about 0.1 m, well
+    # below the simplification tolerance), keeping the JSON payload short
+    COORDINATE_DECIMALS = 6
+    
+    # Characters of HTML encoded and written at a time when saving a map
+    HTML_WRITE_CHUNK = 1 << 20
+    
     # Extended color palette for multiple tracks (20 colors)
     COLORS = [
         '#457B9D',  # Celadon Blue
@@ -70,60 +297,65 @@ class MapViewer(BaseViewer):
         'Red-White-Blue'
     ]
     
-    def get_available_options(self) -> Dict[str, Any]:
-        """Get available configuration options for map viewer"""
-        return {
-            'base_map': {
-                'type': 'combo',
-                'values': self.AVAILABLE_BASE_MAPS,
-                'label': 'Base Map'
-            },
-            'color_mode': {
-                'type': 'combo',
-                'values': self.COLOR_MODES,
-                'label': 'Track Color'
-            },
-            'colormap': {
-                'type': 'combo',
-                'values': self.AVAILABLE_COLORMAPS,
-                'label': 'Colormap'
-            },
-            'show_start_stop': {
-                'type': 'checkbox',
-                'label': 'Show Start/Stop Markers'
-            },
-            'show_legend': {
-                'type': 'checkbox',
-                'label': 'Show Legend'
-            },
-            'show_zoom_controls': {
-                'type': 'checkbox',
-                'label': 'Show Zoom Controls'
-            },
-            'color_min': {
-                'type': 'double_spin',
-                'label': 'Color Min',
-                'range': (-999999, 999999)
-            },
-            'color_max': {
-                'type': 'double_spin',
-                'label': 'Color Max',
-                'range': (-999999, 999999)
-            }
+    # Option descriptions and defaults, built once (see BaseViewer)
+    _AVAILABLE_OPTIONS = MappingProxyType({
+        'base_map': {
+            'type': 'combo',
+            'values': AVAILABLE_BASE_MAPS,
+            'label': 'Base Map'
+        },
+        'color_mode': {
+            'type': 'combo',
+            'values': COLOR_MODES,
+            'label': 'Track Color'
+        },
+        'colormap': {
+            'type': 'combo',
+            'values': AVAILABLE_COLORMAPS,
+            'label': 'Colormap'
+        },
+        'show_start_stop': {
+            'type': 'checkbox',
+            'label': 'Show Start/Stop Markers'
+        },
+        'show_legend': {
+            'type': 'checkbox',
+            'label': 'Show Legend'
+        },
+        'show_zoom_controls': {
+            'type': 'checkbox',
+            'label': 'Show Zoom Controls'
+        },
+        'color_min': {
+            'type': 'double_spin',
+            'label': 'Color Min',
+            'range': (-999999, 999999)
+        },
+        'color_max': {
+            'type': 'double_spin',
+            'label': 'Color Max',
+            'range': (-999999, 999999)
         }
+    })
     
-    def get_default_options(self) -> Dict[str, Any]:
+    _DEFAULT_OPTIONS = MappingProxyType({
+        'base_map': 'OpenTopoMap',
+        'color_mode': 'Plain',
+        'colormap': 'Jet (Blue-Green-Yellow-Red)',
+        'show_start_stop': False,
+        'show_legend': False,
+        'show_zoom_controls': False,
+        'color_min': None,
+        'color_max': None
+    })
+    
+    def get_available_options(self) -> Mapping[str, Any]:
+        """Get available configuration options for map viewer"""
+        return self._AVAILABLE_OPTIONS
+    
+    def get_default_options(self) -> Mapping[str, Any]:
         """Get default values for all options"""
-        return {
-            'base_map': 'OpenTopoMap',
-            'color_mode': 'Plain',
-            'colormap': 'Jet (Blue-Green-Yellow-Red)',
-            'show_start_stop': False,
-            'show_legend': False,
-            'show_zoom_controls': False,
-            'color_min': None,
-            'color_max': None
-        }
+        return self._DEFAULT_OPTIONS
     
     def create_view(self, tracks: List[Track], output_file: str = 'track_map.html', **kwargs) -> tuple:
         """
@@ -140,18 +372,14 @@ class MapViewer(BaseViewer):
         if not tracks:
             raise ValueError("No tracks provided")
         
-        # Extract options with defaults
-        show_start_stop = kwargs.get('show_start_stop', False)
+        # Extract options with defaults (track layer options are read by
+        # _create_track_layer_json)
         base_map = kwargs.get('base_map', 'OpenTopoMap')
         fit_bounds = kwargs.get('fit_bounds', False)
         current_center = kwargs.get('current_center', None)
         current_zoom = kwargs.get('current_zoom', None)
-        color_mode = kwargs.get('color_mode', 'Plain')
-        colormap = kwargs.get('colormap', 'Jet (Blue-Green-Yellow-Red)')
-        show_legend = kwargs.get('show_legend', False)
-        color_min = kwargs.get('color_min', None)
-        color_max = kwargs.get('color_max', None)
         zoom_control = kwargs.get('zoom_control', True)
+        view_bridge = kwargs.get('view_bridge', None)
         
         # Use provided center/zoom or calculate from tracks
         if fit_bounds or current_center is None:
@@ -165,33 +393,18 @@ class MapViewer(BaseViewer):
             zoom = current_zoom
         
         # Create map with selected base layer
-        m = self._create_base_map(center, base_map, zoom, zoom_control)
+        m = self._create_base_map(center, base_map, zoom, zoom_control, view_bridge)
         
-        # Add each track with appropriate coloring
-        if color_mode == 'Plain':
-            # Use solid colors for each track
-            for idx, track in enumerate(tracks):
-                color = self.COLORS[idx % len(self.COLORS)]
-                track.color = color
-                self._add_track_to_map(m, track, color, show_start_stop, color_mode)
-        else:
-            # Use gradient coloring based on attribute
-            for idx, track in enumerate(tracks):
-                color = self.COLORS[idx % len(self.COLORS)]
-                track.color = color
-                self._add_colored_track_to_map(m, track, color, show_start_stop, color_mode, color_min, color_max, colormap)
-        
-        # Add legend if requested
-        if show_legend:
-            self._add_legend(m, tracks, color_mode, color_min, color_max, colormap)
+        # Add tracks, markers and legend
+        TrackLayer(self._create_track_layer_json(tracks, **kwargs)).add_to(m)
         
         # Fit bounds to encompass all tracks if requested
         if fit_bounds:
             bounds = self._calculate_bounds(tracks)
             m.fit_bounds(bounds, padding=[50, 50])
         
-        # Save map
-        m.save(output_file)
+        # Save map (gzip-compressed if asked for with a .gz output file)
+        self._write_html(m.get_root().render(), output_file)
         
         # Return file path and view state
         view_state = {
@@ -203,34 +416,28 @@ class MapViewer(BaseViewer):
     
     def _calculate_center(self, tracks: List[Track]) -> List[float]:
         """Calculate center point of all tracks"""
-        all_lats = []
-        all_lngs = []
-        
-        for track in tracks:
-            for point in track.points:
-                all_lats.append(point.latitude)
-                all_lngs.append(point.longitude)
+        all_lats = np.concatenate([track.lat for track in tracks])
+        all_lngs = np.concatenate([track.lon for track in tracks])
         
-        center_lat = sum(all_lats) / len(all_lats)
-        center_lng = sum(all_lngs) / len(all_lngs)
-        
-        return [center_lat, center_lng]
+        return [float(all_lats.mean()), float(all_lngs.mean())]
     
     def _calculate_bounds(self, tracks: List[Track]) -> List[List[float]]:
         """Calculate bounding box encompassing all tracks"""
-        all_lats = []
-        all_lngs = []
-        
-        for track in tracks:
-            for point in track.points:
-                all_lats.append(point.latitude)
-                all_lngs.append(point.longitude)
+        all_lats = np.concatenate([track.lat for track in tracks])
+        all_lngs = np.concatenate([track.lon for track in tracks])
         
         # Return [[min_lat, min_lng], [max_lat, max_lng]]
-        return [[min(all_lats), min(all_lngs)], [max(all_lats), max(all_lngs)]]
+        return [[float(all_lats.min()), float(all_lngs.min())],
+                [float(all_lats.max()), float(all_lngs.max())]]
     
-    def _create_base_map(self, center: List[float], base_map: str, zoom: int = 13, zoom_control: bool = True) -> folium.Map:
-        """Create a folium map with the specified base layer"""
+    def _create_base_map(self, center: List[float], base_map: str, zoom: int = 13, zoom_control: bool = True,
+                         view_bridge: Optional[str] = None) -> folium.Map:
+        """
+        Create a folium map with the specified base layer
+        
+        If view_bridge is given, the page reports its view to the QWebChannel
+        object registered under that name (see ui.MapViewBridge)
+        """
         
         if base_map == 'Satellite':
             m = folium.Map(
@@ -273,43 +480,89 @@ class MapViewer(BaseViewer):
                 attr='Map data: © OpenStreetMap contributors, SRTM | Map style: © OpenTopoMap'
             )
         
+        if view_bridge:
+            ViewBridge(view_bridge).add_to(m)
+        
         return m
     
-    def _add_track_to_map(self, m: folium.Map, track: Track, color: str, show_start_stop: bool = True, color_mode: str = 'Plain'):
-        """Add a single track to the map"""
-        if len(track) == 0:
-            return
-        
-        # Convert points to [lat, lng] format
-        locations = [point.to_latlng() for point in track.points]
-        
-        # Get line width (default to 5 if not set)
-        line_width = getattr(track, 'line_width', 5)
-        
-        # Add track line
-        folium.PolyLine(
-            locations=locations,
-            color=color,
-            weight=line_width,
-            opacity=0.7,
-            popup=self._create_popup_text(track)
-        ).add_to(m)
-        
-        # Add start and end markers if enabled
-        if show_start_stop:
-            # Add start marker (green)
-            folium.Marker(
-                location=locations[0],
-                popup=f"Start: {track.name}",
-                icon=folium.Icon(color='green', icon='play')
-            ).add_to(m)
+    def _write_html(self, html: str, output_file: str):
+        """
+        Write a page to output_file, gzip-compressed if it ends with .gz
+        
+        The page is encoded and written in chunks so that its encoded copy is
+        never held in memory as a whole.
+        """
+        if output_file.endswith('.gz'):
+            f = gzip.open(output_file, 'wt', encoding='utf-8', newline='', compresslevel=1)
+        else:
+            f = open(output_file, 'w', encoding='utf-8', newline='')
+        with f:
+            for start in range(0, len(html), self.HTML_WRITE_CHUNK):
+                f.write(html[start:start + self.HTML_WRITE_CHUNK])
+    
+    def create_track_layer_script(self, tracks: List[Track], **kwargs) -> str:
+        """
+        Create JavaScript redrawing the track layer of a page produced by create_view
+        
+        Only the track related options (color mode, colormap, color range,
+        markers, legend) are taken into account; the base map and the view are
+        left untouched.
+        
+        Args:
+            tracks: List of Track objects to display
+            **kwargs: Map-specific options (see get_available_options)
             
-            # Add end marker (red)
-            folium.Marker(
-                location=locations[-1],
-                popup=f"End: {track.name}",
-                icon=folium.Icon(color='red', icon='stop')
-            ).add_to(m)
+        Returns:
+            JavaScript code to run in the map page
+        """
+        return ("if (window.trackLayer) { renderTrackLayer(window.trackLayer, %s); }"
+                % self._create_track_layer_json(tracks, **kwargs))
+    
+    def _create_track_layer_json(self, tracks: List[Track], **kwargs) -> str:
+        """Serialize the track layer data consumed by renderTrackLayer()"""
+        show_start_stop = kwargs.get('show_start_stop', False)
+        color_mode = kwargs.get('color_mode', 'Plain')
+        colormap = kwargs.get('colormap', 'Jet (Blue-Green-Yellow-Red)')
+        show_legend = kwargs.get('show_legend', False)
+        color_min = kwargs.get('color_min', None)
+        color_max = kwargs.get('color_max', None)
+        
+        track_data = []
+        for idx, track in enumerate(tracks):
+            if len(track) == 0:
+                continue
+            color = self.COLORS[idx % len(self.COLORS)]
+            track.color = color
+            if color_mode == 'Plain':
+                # Use solid colors for each track
+                track_data.append(self._create_track_data(track, color))
+            else:
+                # Use gradient coloring based on attribute
+                track_data.append(self._create_colored_track_data(track, color, color_mode,
+                                                                  color_min, color_max, colormap))
+        
+        data = {
+            'tracks': track_data,
+            'palette': ([self._value_to_color(i / (self.COLOR_LEVELS - 1), colormap)
+                         for i in range(self.COLOR_LEVELS)]
+                        if color_mode != 'Plain' else []),
+            'no_value': self.COLOR_LEVELS,
+            'show_start_stop': show_start_stop,
+            'legend_html': (self._create_legend_html(tracks, color_mode, color_min, color_max, colormap)
+                            if show_legend else '')
+        }
+        # Keep the data from closing the surrounding <script> element
+        return json.dumps(data).replace('</', '<\\/')
+    
+    def _create_track_data(self, track: Track, color: str) -> Dict[str, Any]:
+        """Create the layer data of a track drawn with a solid color"""
+        return {
+            'name': track.name,
+            'latlngs': track.simplified_latlngs(self.SIMPLIFY_EPSILON, self.COORDINATE_DECIMALS),
+            'color': color,
+            'weight': getattr(track, 'line_width', 5),
+            'popup': self._create_popup_text(track)
+        }
     
     def _create_popup_text(self, track: Track) -> str:
         """Create popup text with track information"""
@@ -325,39 +578,16 @@ class MapViewer(BaseViewer):
         """
         return html
     
-    def _add_legend(self, m: folium.Map, tracks: List[Track], color_mode: str = 'Plain',
-                    color_min: Optional[float] = None, color_max: Optional[float] = None,
-                    colormap: str = 'Jet (Blue-Green-Yellow-Red)'):
-        """Add a legend showing track names and colors or color scale"""
+    def _create_legend_html(self, tracks: List[Track], color_mode: str = 'Plain',
+                            color_min: Optional[float] = None, color_max: Optional[float] = None,
+                            colormap: str = 'Jet (Blue-Green-Yellow-Red)') -> str:
+        """Create a legend showing track names and colors or color scale"""
         if color_mode == 'Plain':
-            # Show track names and colors
-            legend_html = '''
-            <div style="position: fixed; 
-                        top: 10px; right: 10px; 
-                        width: 250px; 
-                        background-color: white; 
-                        border:2px solid grey; 
-                        z-index:9999; 
-                        font-size:14px;
-                        padding: 10px;
-                        border-radius: 5px;
-                        box-shadow: 2px 2px 5px rgba(0,0,0,0.3);">
-                <h4 style="margin-top:0;">GPS Tracks</h4>
-            '''
-            
-            for track in tracks:
-                legend_html += f'''
-                <p style="margin: 5px 0;">
-                    <span style="background-color:{track.color}; 
-                                width: 20px; 
-                                height: 3px; 
-                                display: inline-block; 
-                                margin-right: 5px;"></span>
-                    {track.name} ({track.track_type.upper()})
-                </p>
-                '''
-            
-            legend_html += '</div>'
+            # Show track names and colors, one entry per track joined once
+            entries = [_LEGEND_ENTRY_TEMPLATE.substitute(color=track.color, name=track.name,
+                                                         track_type=track.track_type.upper())
+                       for track in tracks]
+            legend_html = ''.join([_LEGEND_HEADER_HTML, *entries, '</div>'])
         else:
             # Show color scale for attribute
             if color_min is not None and color_max is not None:
@@ -367,138 +597,66 @@ class MapViewer(BaseViewer):
             # Get CSS gradient for the selected colormap
             gradient = self._get_css_gradient(colormap)
             
-            legend_html = f'''
-            <div style="position: fixed; 
-                        top: 10px; right: 10px; 
-                        width: 200px; 
-                        background-color: white; 
-                        border:2px solid grey; 
-                        z-index:9999; 
-                        font-size:14px;
-                        padding: 10px;
-                        border-radius: 5px;
-                        box-shadow: 2px 2px 5px rgba(0,0,0,0.3);">
-                <h4 style="margin-top:0; margin-bottom:10px;">{color_mode}</h4>
-                <div style="display: flex; align-items: stretch;">
-                    <div style="background: {gradient}; 
-                                height: 150px; 
-                                width: 30px;"></div>
-                    <div style="display: flex; 
-                                flex-direction: column; 
-                                justify-content: space-between; 
-                                margin-left: 10px; 
-                                height: 150px;">
-                        <div style="margin-top: 0;">{max_val:.1f}</div>
-                        <div>{(min_val + max_val) / 2:.1f}</div>
-                        <div style="margin-bottom: 0;">{min_val:.1f}</div>
-                    </div>
-                </div>
-            </div>
-            '''
+            legend_html = _COLOR_SCALE_LEGEND_TEMPLATE.substitute(
+                title=color_mode, gradient=gradient,
+                max_label=f'{max_val:.1f}', mid_label=f'{(min_val + max_val) / 2:.1f}',
+                min_label=f'{min_val:.1f}')
         
-        m.get_root().html.add_child(folium.Element(legend_html))
+        return legend_html
     
-    def _add_colored_track_to_map(self, m: folium.Map, track: Track, base_color: str, 
-                                   show_start_stop: bool, color_mode: str,
+    def _create_colored_track_data(self, track: Track, base_color: str, color_mode: str,
                                    color_min: Optional[float] = None,
                                    color_max: Optional[float] = None,
-                                   colormap: str = 'Jet (Blue-Green-Yellow-Red)'):
-        """Add a track to the map with gradient coloring based on attribute"""
-        if len(track) == 0:
-            return
-        
+                                   colormap: str = 'Jet (Blue-Green-Yellow-Red)') -> Dict[str, Any]:
+        """Create the layer data of a track with gradient coloring based on attribute"""
         # Get the attribute values for coloring
-        values = self._get_track_values(track, color_mode)
-        if not values or all(v is None for v in values):
+        attribute = self.COLOR_MODE_ATTRIBUTES.get(color_mode)
+        if attribute is None or attribute not in track.available_attributes:
             # Fallback to plain color if no values available
-            self._add_track_to_map(m, track, base_color, show_start_stop, color_mode)
-            return
-        
-        # Calculate value range
-        valid_values = [v for v in values if v is not None]
-        if not valid_values:
-            self._add_track_to_map(m, track, base_color, show_start_stop, color_mode)
-            return
+            return self._create_track_data(track, base_color)
+        values = track.column(attribute)
+        missing = np.isnan(values)
         
         # Use provided min/max or calculate from data
         if color_min is not None and color_max is not None:
             min_val = color_min
             max_val = color_max
         else:
-            min_val = min(valid_values)
-            max_val = max(valid_values)
-        
-        # Create colored segments
-        for i in range(len(track.points) - 1):
-            if values[i] is not None:
-                # Normalize value to 0-1 range
-                if max_val > min_val:
-                    normalized = (values[i] - min_val) / (max_val - min_val)
-                else:
-                    normalized = 0.5
-                
-                # Get color from gradient using selected colormap
-                color = self._value_to_color(normalized, colormap)
-                
-                # Add segment
-                locations = [track.points[i].to_latlng(), track.points[i + 1].to_latlng()]
-                folium.PolyLine(
-                    locations=locations,
-                    color=color,
-                    weight=3,
-                    opacity=0.8
-                ).add_to(m)
-        
-        # Add start and end markers if enabled
-        if show_start_stop:
-            locations = [point.to_latlng() for point in track.points]
-            folium.Marker(
-                location=locations[0],
-                popup=f"Start: {track.name}",
-                icon=folium.Icon(color='green', icon='play')
-            ).add_to(m)
-            
-            folium.Marker(
-                location=locations[-1],
-                popup=f"End: {track.name}",
-                icon=folium.Icon(color='red', icon='stop')
-            ).add_to(m)
-    
-    def _get_track_values(self, track: Track, color_mode: str):
-        """Extract values from track points based on color mode"""
-        values = []
-        for point in track.points:
-            if color_mode == 'Altitude (m)':
-                values.append(point.altitude)
-            elif color_mode == 'Vertical Speed (m/s)':
-                values.append(point.vertical_speed_ms)
-            elif color_mode == 'Vertical Speed (m/h)':
-                values.append(point.vertical_speed_mh)
-            elif color_mode == 'Power (W)':
-                values.append(point.power)
-            elif color_mode == 'Heart Rate (bpm)':
-                values.append(point.heart_rate)
-            elif color_mode == 'Cadence (rpm)':
-                values.append(point.cadence)
-            elif color_mode == 'Temperature (°C)':
-                values.append(point.temperature)
-            elif color_mode == 'Speed (km/h)':
-                values.append(point.speed)
-            else:
-                values.append(None)
-        return values
+            min_val = np.nanmin(values)
+            max_val = np.nanmax(values)
+        
+        # Normalize value to 0-1 range
+        if max_val > min_val:
+            normalized = np.clip((values - min_val) / (max_val - min_val), 0, 1)
+        else:
+            normalized = np.full(len(values), 0.5)
+        
+        # Palette index of each segment, taken from its first point
+        codes = np.rint(normalized * (self.COLOR_LEVELS - 1))
+        codes[missing] = self.COLOR_LEVELS
+        codes = codes[:-1].astype(np.uint8)
+        
+        return {
+            'name': track.name,
+            'latlngs': track.latlngs(self.COORDINATE_DECIMALS),
+            'codes': base64.b64encode(codes.tobytes()).decode('ascii')
+        }
     
     def _get_value_range(self, tracks: List[Track], color_mode: str):
         """Get min and max values across all tracks for a given attribute"""
-        all_values = []
-        for track in tracks:
-            values = self._get_track_values(track, color_mode)
-            all_values.extend([v for v in values if v is not None])
+        attribute = self.COLOR_MODE_ATTRIBUTES.get(color_mode)
+        if attribute is None or not tracks:
+            return 0, 0
         
-        if not all_values:
+        # Tracks without the attribute are left out before any column is built
+        columns = [track.column(attribute) for track in tracks
+                   if attribute in track.available_attributes]
+        if not columns:
             return 0, 0
+        all_values = np.concatenate(columns)
+        all_values = all_values[~np.isnan(all_values)]
         
-        return min(all_values), max(all_values)
+        return float(all_values.min()), float(all_values.max())
     
     def _get_css_gradient(self, colormap: str) -> str:
         """Generate CSS gradient string based on colormap"""
@@ -687,5 +845,6 @@ class MapViewer(BaseViewer):
         return f'#{r:02x}{g:02x}{b:02x}'
     
     def open_in_browser(self, file_path: str):
-        """Open the HTML file in the default browser"""
-        webbrowser.open('file://' + file_path)
+        """Open the HTML file in the default browser (in its current window when possible)"""
+        # as_uri quotes the path properly (spaces, Windows drive letters)
+        webbrowser.open(Path(file_path).resolve().as_uri(), new=0)
@@ -3,22 +3,23 @@ Power Curve Viewer - Displays power curve data for tracks
 Shows best average power over various durations
 """
 
-from typing import List, Dict, Any, Optional
+from types import MappingProxyType
+from typing import List, Dict, Any, Mapping, Optional
 import matplotlib
 matplotlib.use('Qt5Agg')
 import matplotlib.pyplot as plt
-from matplotlib.figure import Figure
-from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
-from matplotlib.backends.backend_qt5agg import NavigationToolbar2QT as NavigationToolbar
 from models.track import Track
 from viewer.base_viewer import BaseViewer
+from viewer.figure_canvas import FigureCanvasMixin
 
 
-class PowerCurveViewer(BaseViewer):
+class PowerCurveViewer(FigureCanvasMixin, BaseViewer):
     """
     Display power curve data showing best average power over various durations
     """
     
+    FIGSIZE = (12, 6)
+    
     # Duration labels in order
     DURATION_LABELS = ['5s', '10s', '20s', '30s', '1min', '2min', '5min', 
                        '10min', '20min', '30min', '1h', '2h', '5h', 'Total']
@@ -40,34 +41,32 @@ class PowerCurveViewer(BaseViewer):
         '5h': 18000
     }
     
-    def __init__(self):
-        super().__init__()
-        self.figure = None
-        self.canvas = None
-        self.toolbar = None
+    _AVAILABLE_OPTIONS = MappingProxyType({
+        'show_legend': {
+            'type': 'checkbox',
+            'default': True,
+            'label': 'Show Legend'
+        },
+        'plot_style': {
+            'type': 'combo',
+            'values': ['Line', 'Bar'],
+            'default': 'Line',
+            'label': 'Plot Style'
+        }
+    })
+    
+    _DEFAULT_OPTIONS = MappingProxyType({
+        'show_legend': True,
+        'plot_style': 'Line'
+    })
     
-    def get_available_options(self) -> Dict[str, Any]:
+    def get_available_options(self) -> Mapping[str, Any]:
         """Get available configuration options for power curve viewer"""
-        return {
-            'show_legend': {
-                'type': 'checkbox',
-                'default': True,
-                'label': 'Show Legend'
-            },
-            'plot_style': {
-                'type': 'combo',
-                'values': ['Line', 'Bar'],
-                'default': 'Line',
-                'label': 'Plot Style'
-            }
-        }
+        return self._AVAILABLE_OPTIONS
     
-    def get_default_options(self) -> Dict[str, Any]:
+    def get_default_options(self) -> Mapping[str, Any]:
         """Get default options for power curve viewer"""
-        return {
-            'show_legend': True,
-            'plot_style': 'Line'
-        }
+        return self._DEFAULT_OPTIONS
     
     def create_view(self, tracks: List[Track], options: Dict[str, Any] = None) -> tuple:
         """
@@ -84,17 +83,14 @@ class PowerCurveViewer(BaseViewer):
             return self._create_no_power_view()
         
         # Get options
-        opts = self.get_default_options()
+        opts = dict(self.get_default_options())
         if options:
             opts.update(options)
         
         show_legend = opts.get('show_legend', True)
         plot_style = opts.get('plot_style', 'Line')
         
-        # Create figure and canvas
-        self.figure = Figure(figsize=(12, 6), dpi=100)
-        self.canvas = FigureCanvas(self.figure)
-        self.toolbar = NavigationToolbar(self.canvas, None)
+        self._reset_figure()
         
         # Create the plot
         ax = self.figure.add_subplot(111)
@@ -155,6 +151,7 @@ class PowerCurveViewer(BaseViewer):
         
         self.figure.tight_layout()
         
+        self.canvas.draw_idle()
         return self.canvas, self.toolbar
     
     def _calculate_total_duration(self, track: Track) -> float:
@@ -167,9 +164,7 @@ class PowerCurveViewer(BaseViewer):
     
     def _create_empty_view(self) -> tuple:
         """Create an empty view when no tracks are loaded"""
-        self.figure = Figure(figsize=(12, 6), dpi=100)
-        self.canvas = FigureCanvas(self.figure)
-        self.toolbar = NavigationToolbar(self.canvas, None)
+        self._reset_figure()
         
         ax = self.figure.add_subplot(111)
         ax.text(0.5, 0.5, 'No Tracks Loaded\n\nUse "Add Tracks" to load GPS track files with power data',
@@ -182,13 +177,12 @@ class PowerCurveViewer(BaseViewer):
         ax.spines['bottom'].set_visible(False)
         ax.spines['left'].set_visible(False)
         
+        self.canvas.draw_idle()
         return self.canvas, self.toolbar
     
     def _create_no_power_view(self) -> tuple:
         """Create a view when no tracks have power data"""
-        self.figure = Figure(figsize=(12, 6), dpi=100)
-        self.canvas = FigureCanvas(self.figure)
-        self.toolbar = NavigationToolbar(self.canvas, None)
+        self._reset_figure()
         
         ax = self.figure.add_subplot(111)
         ax.text(0.5, 0.5, 'No Power Data Available\n\nLoaded tracks do not contain power measurements',
@@ -201,6 +195,7 @@ class PowerCurveViewer(BaseViewer):
         ax.spines['bottom'].set_visible(False)
         ax.spines['left'].set_visible(False)
         
+        self.canvas.draw_idle()
         return self.canvas, self.toolbar
     
     def get_required_track_attributes(self) -> List[str]:
@@ -0,0 +1,62 @@
+"""
+Smoothing helpers for curve data
+Uses a Numba-compiled kernel when numba is installed, NumPy otherwise
+"""
+
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:  # numba is optional
+    njit = None
+
+
+def _moving_average_numpy(values: np.ndarray, window: int) -> np.ndarray:
+    """Centered moving average, the window shrinking at both ends"""
+    kernel = np.ones(window)
+    sums = np.convolve(values, kernel, mode='same')
+    counts = np.convolve(np.ones(len(values)), kernel, mode='same')
+    return sums / counts
+
+
+if njit is not None:
+    @njit(cache=True, fastmath=True)
+    def _moving_average_kernel(values, window):
+        n = values.shape[0]
+        half = (window - 1) // 2
+        # Running sum over [start, end) as the window slides along the data
+        result = np.empty(n)
+        total = 0.0
+        start = 0
+        end = 0
+        for i in range(n):
+            while end < n and end <= i + half:
+                total += values[end]
+                end += 1
+            while start < i - (window - 1 - half):
+                total -= values[start]
+                start += 1
+            result[i] = total / (end - start)
+        return result
+else:
+    _moving_average_kernel = None
+
+
+def moving_average(values, window: int) -> np.ndarray:
+    """
+    Smooth values with a centered moving average
+
+    Args:
+        values: Sequence of numbers (no missing values)
+        window: Window size in points
+
+    Returns:
+        Array of the same length as values
+    """
+    values = np.asarray(values, dtype=np.float64)
+    if window <= 1 or len(values) < 2:
+        return values
+    window = min(window, len(values))
+    if _moving_average_kernel is not None:
+        return _moving_average_kernel(values, window)
+    return _moving_average_numpy(values, window)